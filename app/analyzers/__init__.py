@@ -1,11 +1,15 @@
-from .base import BaseAnalyzer
+from .base import BaseAnalyzer, Technology
+from .files import RepoFiles
+from .orchestrator import fetch_repo_files, run_analyzers
+from .profile import TechProfile
+from .registry import REGISTRY, TechInfo
+from .languages import LanguageAnalyzer
 from .flutter import FlutterAnalyzer
 from .javascript import JavaScriptAnalyzer
 from .python_fw import PythonAnalyzer
 from .rust import RustAnalyzer
 from .go import GoAnalyzer
 from .devops import DevOpsAnalyzer
-from .languages import LanguageAnalyzer
 
 ALL_ANALYZERS = [
     LanguageAnalyzer(),  # Languages first (from GitHub API)
@@ -19,6 +23,13 @@ ALL_ANALYZERS = [
 
 __all__ = [
     "BaseAnalyzer",
+    "RepoFiles",
+    "fetch_repo_files",
+    "run_analyzers",
+    "Technology",
+    "TechProfile",
+    "TechInfo",
+    "REGISTRY",
     "FlutterAnalyzer",
     "JavaScriptAnalyzer",
     "PythonAnalyzer",
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
+from ..cache import manifest_cache
+from .files import RepoFiles
+from .registry import REGISTRY, TechInfo
 
 
-@dataclass
+@dataclass(slots=True)
 class Technology:
     name: str
     category: str  # framework, runtime, devops, database, etc.
@@ -13,7 +17,16 @@ class Technology:
 
 
 class BaseAnalyzer(ABC):
-    """Base class for technology analyzers."""
+    """Base class for technology analyzers.
+
+    Analyzers declare the paths they need in files_to_check and detect
+    technologies from the prefetched RepoFiles, without any I/O.
+    """
+
+    uses_languages = False  # Needs the GitHub languages breakdown
+    alternatives: tuple[tuple[str, ...], ...] = ()  # Paths where the first existing one wins
+    trigger_languages: Optional[frozenset[str]] = None  # Run only if one is present (None = always)
+    lockfiles: tuple[str, ...] = ()  # Deeper sources, streamed when lockfile analysis is on
 
     @property
     @abstractmethod
@@ -22,21 +35,40 @@ class BaseAnalyzer(ABC):
         pass
 
     @abstractmethod
-    async def analyze(
-        self,
-        owner: str,
-        repo: str,
-        github_client,
-    ) -> list[Technology]:
+    def analyze(self, files: RepoFiles) -> list[TechInfo]:
         """Analyze repository and return detected technologies."""
         pass
 
     def _create_tech(
         self, name: str, category: str, icon: str, color: str
-    ) -> Technology:
-        return Technology(
-            name=name,
-            category=category,
-            icon=icon,
-            color=color,
-        )
+    ) -> TechInfo:
+        return REGISTRY.register(name, category, icon, color)
+
+    def _analyze_manifest(
+        self,
+        files: RepoFiles,
+        path: str,
+        parse: Callable[[str], list[TechInfo]],
+    ) -> Optional[list[TechInfo]]:
+        """Fetch a manifest and parse it, memoized by blob sha.
+
+        Byte-identical manifests share a sha, so a boilerplate file that
+        appears in many repos is decoded and parsed only once.
+        Returns None if the file does not exist.
+        """
+        blob = files.blob(path)
+        if blob is None:
+            return None
+
+        sha = blob.get("sha")
+        cache_key = f"{type(self).__name__}:{path}:{sha}"
+        if sha:
+            tech_ids = manifest_cache.get(cache_key)
+            if tech_ids is not None:
+                return [REGISTRY[tech_id] for tech_id in tech_ids]
+
+        content = files.text(path)
+        technologies = parse(content) if content else []
+        if sha:
+            manifest_cache.set(cache_key, array("H", (tech.id for tech in technologies)))
+        return technologies
@@ -1,92 +1,83 @@
-from .base import BaseAnalyzer, Technology
+from .base import BaseAnalyzer, TechInfo
+from .files import RepoFiles
+
+COMPOSE_FILES = ("docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml")
+KUBERNETES_DIRS = ("kubernetes", "k8s")
+TERRAFORM_PATHS = ("terraform", "main.tf", "infrastructure")
 
 
 class DevOpsAnalyzer(BaseAnalyzer):
     """Analyzer for DevOps tools and configurations."""
 
+    alternatives = (COMPOSE_FILES, TERRAFORM_PATHS)
+
     @property
     def files_to_check(self) -> list[str]:
         return [
             "Dockerfile",
-            "docker-compose.yml",
-            "docker-compose.yaml",
+            *COMPOSE_FILES,
             ".github/workflows",
-            "kubernetes",
-            "k8s",
+            *KUBERNETES_DIRS,
             ".gitlab-ci.yml",
             "Jenkinsfile",
-            "terraform",
-            ".terraform",
+            *TERRAFORM_PATHS,
+            "vercel.json",
+            "netlify.toml",
         ]
 
-    async def analyze(
-        self,
-        owner: str,
-        repo: str,
-        github_client,
-    ) -> list[Technology]:
+    def analyze(self, files: RepoFiles) -> list[TechInfo]:
         technologies = []
 
         # Check Docker
-        if await github_client.check_file_exists(owner, repo, "Dockerfile"):
+        if files.exists("Dockerfile"):
             technologies.append(
                 self._create_tech("Docker", "devops", "docker", "#2496ED")
             )
 
         # Check Docker Compose
-        for compose_file in ["docker-compose.yml", "docker-compose.yaml", "compose.yml", "compose.yaml"]:
-            if await github_client.check_file_exists(owner, repo, compose_file):
-                technologies.append(
-                    self._create_tech("Docker Compose", "devops", "docker", "#2496ED")
-                )
-                break
+        if any(files.exists(compose_file) for compose_file in COMPOSE_FILES):
+            technologies.append(
+                self._create_tech("Docker Compose", "devops", "docker", "#2496ED")
+            )
 
         # Check GitHub Actions
-        workflows = await github_client.get_directory_files(
-            owner, repo, ".github/workflows"
-        )
-        if workflows:
+        if files.directory_files(".github/workflows"):
             technologies.append(
                 self._create_tech("GitHub Actions", "ci", "github-actions", "#2088FF")
             )
 
         # Check Kubernetes
-        for k8s_dir in ["kubernetes", "k8s"]:
-            files = await github_client.get_directory_files(owner, repo, k8s_dir)
-            if files:
-                technologies.append(
-                    self._create_tech("Kubernetes", "devops", "kubernetes", "#326CE5")
-                )
-                break
+        if any(files.directory_files(k8s_dir) for k8s_dir in KUBERNETES_DIRS):
+            technologies.append(
+                self._create_tech("Kubernetes", "devops", "kubernetes", "#326CE5")
+            )
 
         # Check GitLab CI
-        if await github_client.check_file_exists(owner, repo, ".gitlab-ci.yml"):
+        if files.exists(".gitlab-ci.yml"):
             technologies.append(
                 self._create_tech("GitLab CI", "ci", "gitlab", "#FC6D26")
             )
 
         # Check Jenkins
-        if await github_client.check_file_exists(owner, repo, "Jenkinsfile"):
+        if files.exists("Jenkinsfile"):
             technologies.append(
                 self._create_tech("Jenkins", "ci", "jenkins", "#D24939")
             )
 
         # Check Terraform
-        for tf_path in ["terraform", "main.tf", "infrastructure"]:
-            if await github_client.check_file_exists(owner, repo, tf_path):
-                technologies.append(
-                    self._create_tech("Terraform", "iac", "terraform", "#7B42BC")
-                )
-                break
+        if any(files.exists(tf_path) for tf_path in TERRAFORM_PATHS):
+            technologies.append(
+                self._create_tech("Terraform", "iac", "terraform", "#7B42BC")
+            )
 
         # Check Vercel
-        if await github_client.check_file_exists(owner, repo, "vercel.json"):
+        if files.exists("vercel.json"):
             technologies.append(
                 self._create_tech("Vercel", "hosting", "vercel", "#000000")
             )
 
         # Check Netlify
-        if await github_client.check_file_exists(owner, repo, "netlify.toml"):
+        if files.exists("netlify.toml"):
             technologies.append(
                 self._create_tech("Netlify", "hosting", "netlify", "#00C7B7")
             )
@@ -0,0 +1,62 @@
+import posixpath
+
+# Directories that never hold first-party manifests
+IGNORED_DIRS = {
+    "node_modules", "vendor", "third_party", "third-party", ".git", "dist",
+    "build", "target", "out", "__pycache__", ".venv", "venv", ".next",
+}
+# Usual homes of monorepo packages
+SIGNIFICANT_DIRS = {
+    "packages", "apps", "services", "libs", "crates", "cmd", "modules",
+    "backend", "frontend", "server", "client", "web", "api",
+}
+# Manifests here rarely reflect the project's own stack, so they are skipped
+LOW_VALUE_DIRS = {
+    "examples", "example", "samples", "sample", "test", "tests", "testdata",
+    "fixtures", "docs", "benchmarks", "e2e", "demo", "demos",
+}
+
+
+def manifest_rank(path: str) -> tuple[int, int, str]:
+    """Sort key for a nested manifest: most significant first.
+
+    Manifests under a significant directory come first, then shallower
+    ones.
+    """
+    directories = path.split("/")[:-1]
+    significant = any(d.lower() in SIGNIFICANT_DIRS for d in directories)
+    return (int(not significant), len(directories), path)
+
+
+def _is_skipped(directory: str) -> bool:
+    return directory in IGNORED_DIRS or directory.lower() in LOW_VALUE_DIRS
+
+
+def discover_manifests(
+    tree: list[dict],
+    manifest_names: set[str],
+    budget: int,
+) -> tuple[list[str], int]:
+    """Pick nested manifests to analyze from a recursive tree listing.
+
+    Args:
+        tree: Entries of a recursive git tree ({"path", "type", ...})
+        manifest_names: File names analyzers know how to read
+        budget: Maximum number of manifests to return
+
+    Returns:
+        (paths to fetch, best first; number of candidates found)
+    """
+    candidates = []
+    for entry in tree:
+        path = entry.get("path", "")
+        if entry.get("type") != "blob" or "/" not in path:
+            continue  # Root-level files are analyzed already
+        if posixpath.basename(path) not in manifest_names:
+            continue
+        if any(_is_skipped(d) for d in path.split("/")[:-1]):
+            continue  # Vendored code, examples, fixtures, docs
+        candidates.append(path)
+
+    candidates.sort(key=manifest_rank)
+    return candidates[:budget], len(candidates)
@@ -0,0 +1,42 @@
+from typing import Optional
+from ..github_client import GitHubClient
+
+
+class RepoFiles:
+    """Prefetched contents of one repository.
+
+    Maps each path declared in an analyzer's files_to_check to the raw
+    contents API response: a dict for a file, a list for a directory,
+    or None if the path does not exist.
+    """
+
+    def __init__(
+        self,
+        entries: dict[str, Optional[dict | list]],
+        languages: Optional[dict[str, int]] = None,
+    ):
+        self.entries = entries
+        self.languages = languages or {}
+
+    def exists(self, path: str) -> bool:
+        """Check if a file or directory exists."""
+        return self.entries.get(path) is not None
+
+    def blob(self, path: str) -> Optional[dict]:
+        """Get the contents entry of a file, including its blob sha."""
+        data = self.entries.get(path)
+        if data and isinstance(data, dict) and "content" in data:
+            return data
+        return None
+
+    def text(self, path: str) -> Optional[str]:
+        """Get decoded content of a file."""
+        blob = self.blob(path)
+        return GitHubClient.decode_content(blob) if blob else None
+
+    def directory_files(self, path: str) -> list[str]:
+        """Get list of files in a directory."""
+        data = self.entries.get(path)
+        if data and isinstance(data, list):
+            return [item["name"] for item in data if item["type"] == "file"]
+        return []
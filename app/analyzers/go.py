@@ -1,79 +1,43 @@
-from .base import BaseAnalyzer, Technology
+from .base import BaseAnalyzer, TechInfo
+from .files import RepoFiles
+from .rules import match_go_modules
 
 
 class GoAnalyzer(BaseAnalyzer):
     """Analyzer for Go projects."""
 
+    trigger_languages = frozenset({"Go"})
+    lockfiles = ("go.sum",)
+
     @property
     def files_to_check(self) -> list[str]:
         return ["go.mod"]
 
-    async def analyze(
-        self,
-        owner: str,
-        repo: str,
-        github_client,
-    ) -> list[Technology]:
-        technologies = []
-
-        content = await github_client.get_file_content(owner, repo, "go.mod")
-        if not content:
-            return technologies
-
-        content_lower = content.lower()
+    def analyze(self, files: RepoFiles) -> list[TechInfo]:
+        technologies = self._analyze_manifest(files, "go.mod", self._parse)
+        return technologies or []
 
+    def _parse(self, content: str) -> list[TechInfo]:
         # Go is being used
-        technologies.append(
-            self._create_tech("Go", "language", "go", "#00ADD8")
-        )
-
-        # Web frameworks
-        if "github.com/gin-gonic/gin" in content_lower:
-            technologies.append(
-                self._create_tech("Gin", "framework", "gin", "#00ADD8")
-            )
-
-        if "github.com/gofiber/fiber" in content_lower:
-            technologies.append(
-                self._create_tech("Fiber", "framework", "fiber", "#00ACD7")
-            )
-
-        if "github.com/labstack/echo" in content_lower:
-            technologies.append(
-                self._create_tech("Echo", "framework", "echo", "#00ADD8")
-            )
-
-        if "github.com/gorilla/mux" in content_lower:
-            technologies.append(
-                self._create_tech("Gorilla Mux", "framework", "gorilla", "#00ADD8")
-            )
-
-        if "github.com/beego/beego" in content_lower:
-            technologies.append(
-                self._create_tech("Beego", "framework", "beego", "#00ADD8")
-            )
-
-        # Database
-        if "gorm.io/gorm" in content_lower:
-            technologies.append(
-                self._create_tech("GORM", "database", "gorm", "#00ADD8")
-            )
-
-        if "github.com/jmoiron/sqlx" in content_lower:
-            technologies.append(
-                self._create_tech("sqlx", "database", "sqlx", "#00ADD8")
-            )
-
-        # GraphQL
-        if "github.com/99designs/gqlgen" in content_lower:
-            technologies.append(
-                self._create_tech("gqlgen", "api", "graphql", "#E10098")
-            )
-
-        # gRPC
-        if "google.golang.org/grpc" in content_lower:
-            technologies.append(
-                self._create_tech("gRPC", "api", "grpc", "#244C5A")
-            )
-
+        technologies = [self._create_tech("Go", "language", "go", "#00ADD8")]
+        technologies.extend(match_go_modules(self._parse_requires(content)))
         return technologies
+
+    def _parse_requires(self, content: str) -> list[str]:
+        """Extract module paths from require directives."""
+        modules = []
+        in_block = False
+        for line in content.splitlines():
+            line = line.split("//", 1)[0].strip()
+            if in_block:
+                if line == ")":
+                    in_block = False
+                elif line:
+                    modules.append(line.split()[0])
+            elif line.startswith("require"):
+                rest = line[len("require"):].strip()
+                if rest == "(":
+                    in_block = True
+                elif rest:
+                    modules.append(rest.split()[0])
+        return modules
@@ -1,4 +1,6 @@
-from .base import BaseAnalyzer, Technology
+from .base import BaseAnalyzer, TechInfo
+from .files import RepoFiles
+from .registry import REGISTRY
 
 
 # Language colors from GitHub
@@ -52,22 +54,29 @@ LANGUAGE_COLORS = {
 MIN_LANGUAGE_PERCENT = 5
 
 
+def language_icon(lang: str) -> str:
+    """Icon identifier for a GitHub language name."""
+    return lang.lower().replace(" ", "-").replace("#", "sharp").replace("++", "pp")
+
+
+# Register known languages up front so they get stable ids
+for _lang, _color in LANGUAGE_COLORS.items():
+    REGISTRY.register(_lang, "language", language_icon(_lang), _color)
+
+
 class LanguageAnalyzer(BaseAnalyzer):
     """Analyzer that detects programming languages from GitHub API."""
 
+    uses_languages = True
+
     @property
     def files_to_check(self) -> list[str]:
         return []  # Uses GitHub API, not file checks
 
-    async def analyze(
-        self,
-        owner: str,
-        repo: str,
-        github_client,
-    ) -> list[Technology]:
+    def analyze(self, files: RepoFiles) -> list[TechInfo]:
         technologies = []
 
-        languages = await github_client.get_repo_languages(owner, repo)
+        languages = files.languages
         if not languages:
             return technologies
 
@@ -81,9 +90,8 @@ class LanguageAnalyzer(BaseAnalyzer):
             percent = (bytes_count / total_bytes) * 100
             if percent >= MIN_LANGUAGE_PERCENT:
                 color = LANGUAGE_COLORS.get(lang, "#6E7681")
-                icon = lang.lower().replace(" ", "-").replace("#", "sharp").replace("++", "pp")
                 technologies.append(
-                    self._create_tech(lang, "language", icon, color)
+                    self._create_tech(lang, "language", language_icon(lang), color)
                 )
 
         return technologies
@@ -0,0 +1,142 @@
+import re
+from abc import ABC, abstractmethod
+from .registry import TechInfo
+from .rules import DEPENDENCY_INDEX, match_dependencies, normalize_pypi
+
+# package-lock.json: "node_modules/@scope/name": {  (v2/v3)  or  "name": {  (v1)
+NPM_LOCK_KEY_RE = re.compile(r'^\s*"(?:[^"]*node_modules/)?((?:@[^"/]+/)?[^"/@][^"]*)":\s*\{')
+# poetry.lock / Cargo.lock: name = "foo" inside a [[package]] table
+TOML_PACKAGE_NAME_RE = re.compile(r'^name\s*=\s*"([^"]+)"')
+_PNPM_VERSION_RE = re.compile(r"[@/(]")
+
+
+class LockfileScanner(ABC):
+    """Incremental lockfile parser fed one line at a time.
+
+    Only names that some rule in DEPENDENCY_INDEX cares about are kept,
+    so memory stays bounded by the rule table, not by the lockfile.
+    """
+
+    ecosystem: str = ""
+
+    def __init__(self):
+        self._index = DEPENDENCY_INDEX.get(self.ecosystem, {})
+        self.names: set[str] = set()
+
+    @abstractmethod
+    def feed(self, line: str) -> None:
+        """Parse the next line of the lockfile."""
+        pass
+
+    def _keep(self, name: str) -> None:
+        if name in self._index:
+            self.names.add(name)
+
+    def technologies(self) -> list[TechInfo]:
+        return match_dependencies(self.ecosystem, self.names)
+
+
+class NpmLockScanner(LockfileScanner):
+    """package-lock.json (npm v1-v3), which npm always pretty-prints."""
+
+    ecosystem = "npm"
+
+    def feed(self, line: str) -> None:
+        if not line.endswith("{"):
+            return  # Only package keys open an object
+        match = NPM_LOCK_KEY_RE.match(line)
+        if match:
+            self._keep(match.group(1))
+
+
+class YarnLockScanner(LockfileScanner):
+    """yarn.lock (classic and berry): entries start at column 0."""
+
+    ecosystem = "npm"
+
+    def feed(self, line: str) -> None:
+        if not line or line[0] in " #" or not line.rstrip().endswith(":"):
+            return
+        for spec in line.rstrip()[:-1].split(","):
+            spec = spec.strip().strip('"')
+            separator = spec.find("@", 1)  # skip the scope's leading @
+            if separator > 0:
+                self._keep(spec[:separator])
+
+
+class PnpmLockScanner(LockfileScanner):
+    """pnpm-lock.yaml: package keys sit at indent 2 under packages/snapshots.
+
+    Handles /name/1.0.0 (v5), /name@1.0.0 (v6) and name@1.0.0 (v9) keys.
+    """
+
+    ecosystem = "npm"
+
+    def __init__(self):
+        super().__init__()
+        self._in_packages = False
+
+    def feed(self, line: str) -> None:
+        if not line.strip():
+            return
+        if not line.startswith(" "):
+            self._in_packages = line.rstrip() in ("packages:", "snapshots:")
+            return
+        if not self._in_packages or line.startswith("   ") or not line.rstrip().endswith(":"):
+            return
+
+        key = line.strip()[:-1].strip("'\"").lstrip("/")
+        prefix = ""
+        if key.startswith("@"):
+            scope, _, key = key.partition("/")
+            prefix = scope + "/"
+        self._keep(prefix + _PNPM_VERSION_RE.split(key, 1)[0])
+
+
+class TomlPackageScanner(LockfileScanner):
+    """[[package]] tables with a name key (poetry.lock, Cargo.lock)."""
+
+    def feed(self, line: str) -> None:
+        match = TOML_PACKAGE_NAME_RE.match(line)
+        if match:
+            name = match.group(1)
+            self._keep(normalize_pypi(name) if self.ecosystem == "pypi" else name)
+
+
+class PoetryLockScanner(TomlPackageScanner):
+    ecosystem = "pypi"
+
+
+class CargoLockScanner(TomlPackageScanner):
+    ecosystem = "cargo"
+
+
+class GoSumScanner(LockfileScanner):
+    """go.sum: one "module version hash" line per module version."""
+
+    ecosystem = "go"
+
+    def __init__(self):
+        super().__init__()
+        self._last_module = None
+
+    def feed(self, line: str) -> None:
+        module = line.split(" ", 1)[0].lower()
+        if not module or module == self._last_module:
+            return  # Lines are sorted; each module repeats per version
+        self._last_module = module
+        # A rule matches the module path or one of its parents (see match_go_modules)
+        parts = module.split("/")
+        for i in range(len(parts), 0, -1):
+            self._keep("/".join(parts[:i]))
+
+
+# Lockfile name -> scanner class
+LOCKFILE_SCANNERS: dict[str, type[LockfileScanner]] = {
+    "package-lock.json": NpmLockScanner,
+    "yarn.lock": YarnLockScanner,
+    "pnpm-lock.yaml": PnpmLockScanner,
+    "poetry.lock": PoetryLockScanner,
+    "Cargo.lock": CargoLockScanner,
+    "go.sum": GoSumScanner,
+}
@@ -0,0 +1,480 @@
+import asyncio
+import logging
+import os
+import posixpath
+from array import array
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from ..cache import manifest_cache
+from ..github_client import SUPERSEDED, GitHubUnavailable
+from ..metrics import metrics
+from .base import BaseAnalyzer, TechInfo
+from .discovery import discover_manifests
+from .files import RepoFiles
+from .lockfiles import LOCKFILE_SCANNERS
+from .registry import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# on: skip analyzers whose languages are absent from the repo
+# off: always run every analyzer
+# validate: run every analyzer and log detections pruning would have missed
+PRUNING_MODE = os.getenv("ANALYZER_PRUNING", "on")
+# Also stream lockfiles (package-lock.json, go.sum, ...) for transitive dependencies
+LOCKFILES_ENABLED = os.getenv("LOCKFILE_ANALYSIS", "").lower() in ("1", "true", "yes")
+# Nested manifests (monorepo packages) analyzed per repo; 0 disables discovery
+MONOREPO_MANIFEST_BUDGET = int(os.getenv("MONOREPO_MANIFEST_BUDGET", "8"))
+
+
+def _retrieve_exception(task: asyncio.Future) -> None:
+    """Mark a task's exception as retrieved (whoever awaits it reports it)."""
+    if not task.cancelled():
+        task.exception()
+
+
+@contextmanager
+def _cancelling(tasks: list[asyncio.Future]) -> Iterator[None]:
+    """Cancel tasks still running when the block exits.
+
+    After the block finished or failed they are superseded (see
+    github_client.SUPERSEDED); if it was cancelled itself, they are
+    cancelled for the same reason. A cancelled task may still end with
+    an exception (a response can beat the cancellation), so exceptions
+    of tasks nobody awaits are retrieved whenever they finish.
+    """
+    for task in tasks:
+        task.add_done_callback(_retrieve_exception)
+    message = SUPERSEDED
+    try:
+        yield
+    except asyncio.CancelledError as e:
+        message = e.args[0] if e.args else None
+        raise
+    finally:
+        for task in tasks:
+            task.cancel(message)
+
+
+async def probe_alternatives(
+    owner: str,
+    repo: str,
+    github_client,
+    paths: tuple[str, ...],
+) -> dict[str, Optional[dict | list]]:
+    """Probe alternative paths concurrently; the first existing one wins.
+
+    All probes start at once, and the result is returned as soon as the
+    winner is known. Probes of lower-priority paths still waiting for a
+    connection slot are cancelled. GitHubUnavailable from a probe that
+    decides the winner propagates.
+    """
+    tasks = [
+        asyncio.ensure_future(github_client.get_repo_contents(owner, repo, path))
+        for path in paths
+    ]
+    entries = {}
+    with _cancelling(tasks):
+        for path, task in zip(paths, tasks):
+            try:
+                entries[path] = await task
+            except GitHubUnavailable:
+                raise
+            except Exception:
+                entries[path] = None
+            if entries[path] is not None:
+                break
+    return entries
+
+
+async def fetch_repo_files(
+    owner: str,
+    repo: str,
+    github_client,
+    analyzers: list[BaseAnalyzer],
+    with_languages: bool = False,
+    languages: Optional[dict[str, int]] = None,
+) -> RepoFiles:
+    """Fetch everything the analyzers need from a repository.
+
+    The union of all declared paths is requested once, concurrently;
+    paths declared by several analyzers are fetched only once. Groups of
+    alternatives are probed with probe_alternatives().
+
+    Raises GitHubUnavailable if any path could not be fetched, rather
+    than treating it as absent.
+
+    Args:
+        with_languages: Also fetch the languages breakdown, even if no
+            analyzer uses it
+        languages: Languages breakdown already known (e.g. from the
+            GraphQL listing); it is not fetched again
+    """
+    groups = list(dict.fromkeys(
+        group for analyzer in analyzers for group in analyzer.alternatives
+    ))
+    grouped = {path for group in groups for path in group}
+    paths = list(dict.fromkeys(
+        path for analyzer in analyzers for path in analyzer.files_to_check
+        if path not in grouped
+    ))
+    fetch_languages = languages is None and (
+        with_languages or any(analyzer.uses_languages for analyzer in analyzers)
+    )
+
+    requests = [github_client.get_repo_contents(owner, repo, path) for path in paths]
+    requests.extend(probe_alternatives(owner, repo, github_client, group) for group in groups)
+    if fetch_languages:
+        requests.append(github_client.get_repo_languages(owner, repo))
+
+    results = await asyncio.gather(*requests, return_exceptions=True)
+    _raise_unavailable(results)
+    results = [None if isinstance(r, BaseException) else r for r in results]
+
+    if fetch_languages:
+        languages = results.pop()
+    entries = dict(zip(paths, results))
+    for probed in results[len(paths):]:
+        entries.update(probed or {})
+    return RepoFiles(entries, languages)
+
+
+def _raise_unavailable(results: list) -> None:
+    """Re-raise the first GitHubUnavailable among gathered results."""
+    for result in results:
+        if isinstance(result, GitHubUnavailable):
+            raise result
+
+
+def _declared_paths(analyzers: list[BaseAnalyzer]) -> set[str]:
+    return {path for analyzer in analyzers for path in analyzer.files_to_check}
+
+
+def plan_analyzers(
+    analyzers: list[BaseAnalyzer],
+    languages: dict[str, int],
+) -> tuple[list[BaseAnalyzer], list[BaseAnalyzer]]:
+    """Split analyzers into those that can match a repository and the rest.
+
+    An analyzer is pruned when it declares trigger_languages and none of
+    them appear in the repository's languages. Nothing is pruned when
+    the languages are unknown.
+    """
+    if not languages:
+        return list(analyzers), []
+
+    kept, pruned = [], []
+    for analyzer in analyzers:
+        triggers = analyzer.trigger_languages
+        if triggers is None or not triggers.isdisjoint(languages):
+            kept.append(analyzer)
+        else:
+            pruned.append(analyzer)
+    return kept, pruned
+
+
+async def run_analyzers(
+    owner: str,
+    repo: str,
+    github_client,
+    analyzers: list[BaseAnalyzer],
+    languages: Optional[dict[str, int]] = None,
+) -> list[TechInfo]:
+    """Prefetch a repository's files and run the analyzers on them.
+
+    Analyzers that always run are fetched together with the languages
+    breakdown (unless it is passed in). The breakdown then decides which
+    language-specific analyzers are worth fetching for (see plan_analyzers).
+
+    Nested manifests found in the repository tree are analyzed too, up
+    to MONOREPO_MANIFEST_BUDGET (see fetch_nested_manifests). They are
+    fetched as soon as the tree and the analyzer plan are known,
+    alongside the root manifests.
+    """
+    planned = asyncio.get_running_loop().create_future()  # Analyzers to run
+    nested_task = None
+    side_tasks = []
+    if MONOREPO_MANIFEST_BUDGET > 0 and any(_is_nestable(a) for a in analyzers):
+        names = {
+            path for analyzer in analyzers if _is_nestable(analyzer)
+            for path in analyzer.files_to_check
+        }
+        if LOCKFILES_ENABLED:
+            names.update(LOCKFILE_SCANNERS)
+        tree_task = asyncio.ensure_future(
+            _fetch_tree(owner, repo, github_client, frozenset(names))
+        )
+
+        async def fetch_nested() -> dict[str, dict]:
+            tree = await tree_task
+            return await fetch_nested_manifests(owner, repo, github_client, tree, await planned)
+
+        nested_task = asyncio.ensure_future(fetch_nested())
+        side_tasks = [nested_task, tree_task]
+
+    with _cancelling(side_tasks):
+        if PRUNING_MODE == "off":
+            planned.set_result(analyzers)
+            files = await fetch_repo_files(
+                owner, repo, github_client, analyzers, languages=languages
+            )
+            selected = analyzers
+        else:
+            files, selected = await _fetch_pruned(
+                owner, repo, github_client, analyzers, languages, planned
+            )
+
+        technologies = _run(owner, repo, files, selected)
+        if LOCKFILES_ENABLED:
+            shas = await _root_blob_shas(tree_task) if nested_task is not None else {}
+            technologies.extend(await scan_lockfiles(
+                owner, repo, github_client, files, selected, technologies, shas
+            ))
+        if nested_task is not None:
+            technologies.extend(analyze_nested_manifests(
+                owner, repo, await nested_task, selected, technologies
+            ))
+    return technologies
+
+
+def _is_nestable(analyzer: BaseAnalyzer) -> bool:
+    """Language-specific manifest analyzers also apply to subdirectories."""
+    return analyzer.trigger_languages is not None
+
+
+async def _fetch_pruned(
+    owner: str,
+    repo: str,
+    github_client,
+    analyzers: list[BaseAnalyzer],
+    languages: Optional[dict[str, int]],
+    planned: Optional[asyncio.Future] = None,
+) -> tuple[RepoFiles, list[BaseAnalyzer]]:
+    """Fetch files for the analyzers kept by plan_analyzers.
+
+    With languages already known, everything is fetched in one round
+    trip. Otherwise only the language-specific manifests wait for the
+    /languages response; the other analyzers' files are fetched
+    alongside it.
+
+    Args:
+        planned: Resolved with the analyzers to run as soon as they are
+            known, before their files are fetched
+
+    Returns the files and the analyzers to run (all of them in
+    validation mode, after logging what pruning would have missed).
+    """
+    unconditional = [a for a in analyzers if a.trigger_languages is None]
+    conditional = [a for a in analyzers if a.trigger_languages is not None]
+
+    base = None
+    if languages is None:
+        base = asyncio.ensure_future(
+            fetch_repo_files(owner, repo, github_client, unconditional, languages={})
+        )
+    with _cancelling([base] if base is not None else []):
+        if languages is None:
+            languages = await github_client.get_repo_languages(owner, repo)
+        kept, pruned = plan_analyzers(conditional, languages)
+        validate = PRUNING_MODE == "validate"
+        if validate:
+            selected = analyzers
+        else:
+            kept_ids = {id(analyzer) for analyzer in unconditional + kept}
+            selected = [a for a in analyzers if id(a) in kept_ids]
+        if planned is not None:
+            planned.set_result(selected)
+
+        if pruned:
+            needed = _declared_paths(unconditional) | _declared_paths(kept)
+            metrics.incr("analyzers_pruned", len(pruned))
+            metrics.incr("probes_pruned", len(_declared_paths(pruned) - needed))
+
+        to_fetch = conditional if validate else kept
+        if base is None:
+            to_fetch = unconditional + to_fetch
+        files = await fetch_repo_files(
+            owner, repo, github_client, to_fetch, languages=languages
+        )
+        if base is not None:
+            files.entries.update((await base).entries)
+
+    if validate:
+        for analyzer in pruned:
+            missed = _run(owner, repo, files, [analyzer])
+            if missed:
+                metrics.incr("pruning_misses")
+                logger.warning(
+                    f"Pruning {type(analyzer).__name__} on {owner}/{repo} would miss "
+                    f"{[tech.name for tech in missed]} (languages: {sorted(files.languages)})"
+                )
+    return files, selected
+
+
+async def _fetch_tree(owner: str, repo: str, github_client, names: frozenset[str]) -> list[dict]:
+    """List the repository's files with some names, if GitHub answers.
+
+    Nested manifests are optional: a failed listing means none are
+    analyzed, not a failed repository.
+    """
+    try:
+        return await github_client.get_repo_tree(owner, repo, names)
+    except GitHubUnavailable as e:
+        metrics.incr("repo_trees_failed")
+        logger.warning(f"Listing {owner}/{repo} failed, skipping nested manifests: {e}")
+        return []
+
+
+async def _root_blob_shas(tree_task: asyncio.Future) -> dict[str, str]:
+    """Blob shas of the files at the root of a tree listing."""
+    tree = await asyncio.shield(tree_task)
+    return {
+        entry["path"]: entry["sha"]
+        for entry in tree
+        if entry.get("type") == "blob" and "/" not in entry["path"] and entry.get("sha")
+    }
+
+
+async def scan_lockfiles(
+    owner: str,
+    repo: str,
+    github_client,
+    files: RepoFiles,
+    analyzers: list[BaseAnalyzer],
+    detected: list[TechInfo],
+    shas: Optional[dict[str, str]] = None,
+) -> list[TechInfo]:
+    """Stream the lockfiles of analyzers whose manifests exist.
+
+    Lockfiles also list transitive dependencies. They are parsed line by
+    line as they download (see lockfiles.py), concurrently. Like
+    manifests, results are memoized by blob sha, so an unchanged lockfile
+    is streamed only once. Returns only technologies not already detected.
+
+    Args:
+        shas: Blob sha per path, from the tree listing; lockfiles without
+            one are streamed every time
+    """
+    shas = shas or {}
+    paths = list(dict.fromkeys(
+        path
+        for analyzer in analyzers
+        if any(files.exists(manifest) for manifest in analyzer.files_to_check)
+        for path in analyzer.lockfiles
+    ))
+
+    async def scan(path: str) -> list[TechInfo]:
+        scanner = LOCKFILE_SCANNERS[path]()
+        sha = shas.get(path)
+        cache_key = f"{type(scanner).__name__}:{path}:{sha}"
+        if sha:
+            tech_ids = manifest_cache.get(cache_key)
+            if tech_ids is not None:
+                metrics.incr("lockfiles_cached")
+                return [REGISTRY[tech_id] for tech_id in tech_ids]
+
+        async for line in github_client.stream_file_lines(owner, repo, path):
+            scanner.feed(line)
+        metrics.incr("lockfiles_scanned")
+        technologies = scanner.technologies()
+        if sha:
+            manifest_cache.set(cache_key, array("H", (tech.id for tech in technologies)))
+        return technologies
+
+    results = await asyncio.gather(*(scan(path) for path in paths), return_exceptions=True)
+
+    seen = {tech.id for tech in detected}
+    technologies = []
+    for path, result in zip(paths, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"Scanning {owner}/{repo}/{path} failed: {result}")
+            continue
+        for tech in result:
+            if tech.id not in seen:
+                seen.add(tech.id)
+                technologies.append(tech)
+    return technologies
+
+
+async def fetch_nested_manifests(
+    owner: str,
+    repo: str,
+    github_client,
+    tree: list[dict],
+    analyzers: list[BaseAnalyzer],
+) -> dict[str, dict]:
+    """Fetch manifests below the repository root (monorepo packages).
+
+    Candidates come from a single recursive tree listing and are ranked
+    by discover_manifests(); at most MONOREPO_MANIFEST_BUDGET of them are
+    fetched, concurrently.
+
+    Returns:
+        directory -> {file name: contents entry} for manifests that exist
+    """
+    names = {
+        path for analyzer in analyzers if _is_nestable(analyzer)
+        for path in analyzer.files_to_check
+    }
+    paths, found = discover_manifests(tree, names, MONOREPO_MANIFEST_BUDGET)
+    if not found:
+        return {}
+    metrics.incr("nested_manifests_found", found)
+    metrics.incr("nested_manifests_fetched", len(paths))
+
+    results = await asyncio.gather(
+        *(github_client.get_repo_contents(owner, repo, path) for path in paths),
+        return_exceptions=True,
+    )
+    _raise_unavailable(results)
+
+    directories: dict[str, dict] = {}
+    for path, result in zip(paths, results):
+        if result is None or isinstance(result, BaseException):
+            continue
+        directory, name = posixpath.split(path)
+        directories.setdefault(directory, {})[name] = result
+    return directories
+
+
+def analyze_nested_manifests(
+    owner: str,
+    repo: str,
+    directories: dict[str, dict],
+    analyzers: list[BaseAnalyzer],
+    detected: list[TechInfo],
+) -> list[TechInfo]:
+    """Run the analyzers on each directory's nested manifests.
+
+    Manifests in the same directory are analyzed together. Returns only
+    technologies not already detected.
+    """
+    nestable = [analyzer for analyzer in analyzers if _is_nestable(analyzer)]
+    seen = {tech.id for tech in detected}
+    technologies = []
+    for directory, entries in directories.items():
+        files = RepoFiles(entries)
+        present = [
+            analyzer for analyzer in nestable
+            if any(files.exists(path) for path in analyzer.files_to_check)
+        ]
+        for tech in _run(owner, f"{repo}/{directory}", files, present):
+            if tech.id not in seen:
+                seen.add(tech.id)
+                technologies.append(tech)
+    return technologies
+
+
+def _run(
+    owner: str,
+    repo: str,
+    files: RepoFiles,
+    analyzers: list[BaseAnalyzer],
+) -> list[TechInfo]:
+    technologies = []
+    for analyzer in analyzers:
+        metrics.incr("analyzers_run")
+        try:
+            technologies.extend(analyzer.analyze(files))
+        except Exception as e:
+            logger.warning(f"{type(analyzer).__name__} failed on {owner}/{repo}: {e}")
+    return technologies
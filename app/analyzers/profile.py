@@ -0,0 +1,141 @@
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from itertools import chain
+from typing import Iterable, Optional
+from .base import Technology
+from .registry import REGISTRY
+
+
+@dataclass(frozen=True)
+class Completeness:
+    """How many of a user's repos an analysis covered.
+
+    Skipped repos were left out on purpose (forks, empty repos, beyond
+    the analysis limit); failed ones could not be analyzed, e.g. because
+    GitHub was unavailable or rate limiting us.
+    """
+
+    attempted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.failed == 0
+
+
+@dataclass(frozen=True)
+class TechProfile:
+    """Technologies aggregated by name, ready to render.
+
+    Built once per analysis and cached, so renders and endpoints never
+    re-aggregate the raw per-repo detections.
+    """
+
+    technologies: tuple[Technology, ...]  # sorted by count, descending
+    counts: dict[str, int]  # name -> number of detections
+    categories: dict[str, tuple[int, ...]]  # category -> indices into technologies
+    fingerprint: str  # stable digest of the aggregated data
+    completeness: Completeness = Completeness()
+    _subsets: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def from_technologies(cls, technologies: list[Technology]) -> "TechProfile":
+        """Aggregate raw detections by name and sort by count."""
+        return cls._merged(
+            (t.name, t.category, t.icon, t.color, t.count) for t in technologies
+        )
+
+    @classmethod
+    def from_ids(
+        cls,
+        id_arrays: Iterable[Iterable[int]],
+        completeness: Completeness = Completeness(),
+    ) -> "TechProfile":
+        """Aggregate per-repo arrays of technology ids by counting."""
+        counts = Counter(chain.from_iterable(id_arrays))
+        detections = []
+        for tech_id, count in counts.items():
+            info = REGISTRY[tech_id]
+            detections.append((info.name, info.category, info.icon, info.color, count))
+        return cls._merged(detections, completeness)
+
+    @classmethod
+    def _merged(
+        cls,
+        detections: Iterable[tuple[str, str, str, str, int]],
+        completeness: Completeness = Completeness(),
+    ) -> "TechProfile":
+        """Merge (name, category, icon, color, count) detections by name.
+
+        A name detected in several categories (the Svelte language and
+        framework) is shown once, with its first-seen category, and is
+        listed under the other categories too (see only()).
+        """
+        tech_map: dict[str, Technology] = {}
+        other_categories: dict[str, list[str]] = {}
+        for name, category, icon, color, count in detections:
+            tech = tech_map.get(name)
+            if tech is None:
+                tech_map[name] = Technology(name, category, icon, color, count)
+                continue
+            tech.count += count
+            others = other_categories.setdefault(name, [])
+            if category != tech.category and category not in others:
+                others.append(category)
+
+        # Sort by count (descending); ties keep first-seen order
+        sorted_techs = sorted(tech_map.values(), key=lambda t: t.count, reverse=True)
+        return cls._from_sorted(tuple(sorted_techs), completeness, other_categories)
+
+    @classmethod
+    def _from_sorted(
+        cls,
+        technologies: tuple[Technology, ...],
+        completeness: Completeness = Completeness(),
+        other_categories: Optional[dict[str, list[str]]] = None,
+    ) -> "TechProfile":
+        other_categories = other_categories or {}
+        categories: dict[str, list[int]] = {}
+        for index, tech in enumerate(technologies):
+            categories.setdefault(tech.category, []).append(index)
+            for category in other_categories.get(tech.name, ()):
+                categories.setdefault(category, []).append(index)
+
+        digest = hashlib.sha1()
+        for t in technologies:
+            digest.update(f"{t.name}\0{t.category}\0{t.icon}\0{t.color}\0{t.count}\n".encode())
+            for category in other_categories.get(t.name, ()):
+                digest.update(f"{t.name}\0{category}\n".encode())
+
+        return cls(
+            technologies=technologies,
+            counts={t.name: t.count for t in technologies},
+            categories={cat: tuple(idx) for cat, idx in categories.items()},
+            fingerprint=digest.hexdigest(),
+            completeness=completeness,
+        )
+
+    def __len__(self) -> int:
+        return len(self.technologies)
+
+    def top(self, k: int = None) -> tuple[Technology, ...]:
+        """Return the k most used technologies (all if k is None)."""
+        if k is None:
+            return self.technologies
+        return self.technologies[:k]
+
+    def only(self, category: str) -> "TechProfile":
+        """Return the sub-profile of a single category (memoized)."""
+        subset = self._subsets.get(category)
+        if subset is None:
+            technologies = (self.technologies[i] for i in self.categories.get(category, ()))
+            subset = self._from_sorted(
+                tuple(t if t.category == category else replace(t, category=category)
+                      for t in technologies),
+                self.completeness,
+            )
+            self._subsets[category] = subset
+        return subset
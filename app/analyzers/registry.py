@@ -0,0 +1,71 @@
+import sys
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class TechInfo:
+    """Immutable, interned metadata for one known technology."""
+
+    id: int
+    name: str
+    category: str
+    icon: str
+    color: str
+
+
+class TechRegistry:
+    """Assigns every technology a small integer id.
+
+    Analyzers share one TechInfo instance per technology instead of
+    allocating a new object per detection, and per-repo results are
+    stored as compact arrays of ids (an order of magnitude smaller, see
+    benchmarks/bench_memory.py). A technology is identified by its
+    name and category, so a name used in two categories (the Svelte
+    language and the Svelte framework) gets two entries, whichever
+    module registers first.
+    """
+
+    def __init__(self):
+        self._techs: list[TechInfo] = []
+        self._ids: dict[tuple[str, str], int] = {}
+
+    def register(self, name: str, category: str, icon: str, color: str) -> TechInfo:
+        """Return the TechInfo for a name and category, registering it on first use.
+
+        Raises:
+            ValueError: The technology is already registered with another
+                icon or color (two detection sources disagree about it)
+        """
+        tech_id = self._ids.get((name, category))
+        if tech_id is not None:
+            tech = self._techs[tech_id]
+            if (tech.icon, tech.color) != (icon, color):
+                raise ValueError(
+                    f"{name!r} ({category}) is registered as {(tech.icon, tech.color)}, "
+                    f"not {(icon, color)}"
+                )
+            return tech
+
+        tech = TechInfo(
+            id=len(self._techs),
+            name=sys.intern(name),
+            category=sys.intern(category),
+            icon=sys.intern(icon),
+            color=sys.intern(color),
+        )
+        self._techs.append(tech)
+        self._ids[(tech.name, tech.category)] = tech.id
+        return tech
+
+    def get(self, name: str, category: str) -> TechInfo | None:
+        tech_id = self._ids.get((name, category))
+        return self._techs[tech_id] if tech_id is not None else None
+
+    def __getitem__(self, tech_id: int) -> TechInfo:
+        return self._techs[tech_id]
+
+    def __len__(self) -> int:
+        return len(self._techs)
+
+
+REGISTRY = TechRegistry()
@@ -0,0 +1,236 @@
+import re
+from typing import Iterable
+from .registry import REGISTRY, TechInfo
+
+# Dependency rules: (ecosystem, dependency name, technology, category, icon, color).
+# Adding a technology means adding a row. Several rows may map to the same
+# technology. Detections are reported in table order.
+RULES: list[tuple[str, str, str, str, str, str]] = [
+    # npm (package.json)
+    ("npm", "react", "React", "framework", "react", "#61DAFB"),
+    ("npm", "react-native", "React Native", "framework", "react", "#61DAFB"),
+    ("npm", "next", "Next.js", "framework", "nextjs", "#000000"),
+    ("npm", "vue", "Vue.js", "framework", "vue", "#4FC08D"),
+    ("npm", "nuxt", "Nuxt", "framework", "nuxt", "#00DC82"),
+    ("npm", "@angular/core", "Angular", "framework", "angular", "#DD0031"),
+    ("npm", "svelte", "Svelte", "framework", "svelte", "#FF3E00"),
+    ("npm", "express", "Express", "backend", "express", "#000000"),
+    ("npm", "fastify", "Fastify", "backend", "fastify", "#000000"),
+    ("npm", "nest", "NestJS", "backend", "nestjs", "#E0234E"),
+    ("npm", "@nestjs/core", "NestJS", "backend", "nestjs", "#E0234E"),
+    ("npm", "typescript", "TypeScript", "language", "typescript", "#3178C6"),
+    ("npm", "vite", "Vite", "build", "vite", "#646CFF"),
+    ("npm", "webpack", "Webpack", "build", "webpack", "#8DD6F9"),
+    ("npm", "jest", "Jest", "testing", "jest", "#C21325"),
+    ("npm", "vitest", "Vitest", "testing", "vitest", "#6E9F18"),
+    ("npm", "redux", "Redux", "state", "redux", "#764ABC"),
+    ("npm", "@reduxjs/toolkit", "Redux", "state", "redux", "#764ABC"),
+    ("npm", "zustand", "Zustand", "state", "zustand", "#433D3C"),
+    ("npm", "tailwindcss", "Tailwind CSS", "styling", "tailwind", "#06B6D4"),
+    ("npm", "remix", "Remix", "framework", "remix", "#000000"),
+    ("npm", "@remix-run/react", "Remix", "framework", "remix", "#000000"),
+    ("npm", "astro", "Astro", "framework", "astro", "#FF5D01"),
+    ("npm", "gatsby", "Gatsby", "framework", "gatsby", "#663399"),
+    ("npm", "electron", "Electron", "framework", "electron", "#47848F"),
+    ("npm", "solid-js", "SolidJS", "framework", "solid", "#2C4F7C"),
+    ("npm", "prisma", "Prisma", "database", "prisma", "#2D3748"),
+    ("npm", "@prisma/client", "Prisma", "database", "prisma", "#2D3748"),
+    ("npm", "graphql", "GraphQL", "api", "graphql", "#E10098"),
+    ("npm", "@apollo/client", "GraphQL", "api", "graphql", "#E10098"),
+    ("npm", "axios", "Axios", "http", "axios", "#5A29E4"),
+    ("npm", "socket.io", "Socket.io", "realtime", "socketio", "#010101"),
+    ("npm", "socket.io-client", "Socket.io", "realtime", "socketio", "#010101"),
+    ("npm", "styled-components", "Styled Components", "styling", "styled", "#DB7093"),
+    ("npm", "@emotion/react", "Emotion", "styling", "emotion", "#D36AC2"),
+    ("npm", "@emotion/styled", "Emotion", "styling", "emotion", "#D36AC2"),
+    ("npm", "@mui/material", "MUI", "ui", "mui", "#007FFF"),
+    ("npm", "@material-ui/core", "MUI", "ui", "mui", "#007FFF"),
+    ("npm", "@chakra-ui/react", "Chakra UI", "ui", "chakra", "#319795"),
+    ("npm", "three", "Three.js", "graphics", "threejs", "#000000"),
+    ("npm", "@trpc/client", "tRPC", "api", "trpc", "#2596BE"),
+    ("npm", "@trpc/server", "tRPC", "api", "trpc", "#2596BE"),
+
+    # PyPI (requirements.txt, pyproject.toml, Pipfile, setup.py)
+    ("pypi", "django", "Django", "framework", "django", "#092E20"),
+    ("pypi", "fastapi", "FastAPI", "framework", "fastapi", "#009688"),
+    ("pypi", "flask", "Flask", "framework", "flask", "#000000"),
+    ("pypi", "starlette", "Starlette", "framework", "starlette", "#392E59"),
+    ("pypi", "aiohttp", "aiohttp", "backend", "aiohttp", "#2C5BB4"),
+    ("pypi", "pandas", "Pandas", "data", "pandas", "#150458"),
+    ("pypi", "numpy", "NumPy", "data", "numpy", "#013243"),
+    ("pypi", "tensorflow", "TensorFlow", "ml", "tensorflow", "#FF6F00"),
+    ("pypi", "tensorflow-gpu", "TensorFlow", "ml", "tensorflow", "#FF6F00"),
+    ("pypi", "tensorflow-cpu", "TensorFlow", "ml", "tensorflow", "#FF6F00"),
+    ("pypi", "torch", "PyTorch", "ml", "pytorch", "#EE4C2C"),
+    ("pypi", "pytorch", "PyTorch", "ml", "pytorch", "#EE4C2C"),
+    ("pypi", "scikit-learn", "Scikit-learn", "ml", "sklearn", "#F7931E"),
+    ("pypi", "sklearn", "Scikit-learn", "ml", "sklearn", "#F7931E"),
+    ("pypi", "sqlalchemy", "SQLAlchemy", "database", "sqlalchemy", "#D71F00"),
+    ("pypi", "pytest", "Pytest", "testing", "pytest", "#0A9EDC"),
+    ("pypi", "celery", "Celery", "backend", "celery", "#37814A"),
+    ("pypi", "pydantic", "Pydantic", "validation", "pydantic", "#E92063"),
+    ("pypi", "httpx", "HTTPX", "http", "httpx", "#3B82F6"),
+    ("pypi", "scrapy", "Scrapy", "scraping", "scrapy", "#60A839"),
+    ("pypi", "beautifulsoup4", "BeautifulSoup", "scraping", "bs4", "#3F4F75"),
+    ("pypi", "bs4", "BeautifulSoup", "scraping", "bs4", "#3F4F75"),
+    ("pypi", "streamlit", "Streamlit", "ui", "streamlit", "#FF4B4B"),
+    ("pypi", "gradio", "Gradio", "ui", "gradio", "#F97316"),
+    ("pypi", "alembic", "Alembic", "database", "alembic", "#6BA81E"),
+    ("pypi", "redis", "Redis", "database", "redis", "#DC382D"),
+    ("pypi", "pymongo", "MongoDB", "database", "mongodb", "#47A248"),
+    ("pypi", "motor", "MongoDB", "database", "mongodb", "#47A248"),
+    ("pypi", "uvicorn", "Uvicorn", "server", "uvicorn", "#499848"),
+    ("pypi", "gunicorn", "Gunicorn", "server", "gunicorn", "#499848"),
+
+    # Go modules (go.mod); a rule also matches sub-packages and /vN paths
+    ("go", "github.com/gin-gonic/gin", "Gin", "framework", "gin", "#00ADD8"),
+    ("go", "github.com/gofiber/fiber", "Fiber", "framework", "fiber", "#00ACD7"),
+    ("go", "github.com/labstack/echo", "Echo", "framework", "echo", "#00ADD8"),
+    ("go", "github.com/gorilla/mux", "Gorilla Mux", "framework", "gorilla", "#00ADD8"),
+    ("go", "github.com/beego/beego", "Beego", "framework", "beego", "#00ADD8"),
+    ("go", "gorm.io/gorm", "GORM", "database", "gorm", "#00ADD8"),
+    ("go", "github.com/jmoiron/sqlx", "sqlx", "database", "sqlx", "#00ADD8"),
+    ("go", "github.com/99designs/gqlgen", "gqlgen", "api", "graphql", "#E10098"),
+    ("go", "google.golang.org/grpc", "gRPC", "api", "grpc", "#244C5A"),
+
+    # Cargo (Cargo.toml)
+    ("cargo", "actix-web", "Actix Web", "framework", "actix", "#000000"),
+    ("cargo", "rocket", "Rocket", "framework", "rocket", "#D33847"),
+    ("cargo", "axum", "Axum", "framework", "axum", "#000000"),
+    ("cargo", "warp", "Warp", "framework", "warp", "#000000"),
+    ("cargo", "tokio", "Tokio", "runtime", "tokio", "#000000"),
+    ("cargo", "diesel", "Diesel", "database", "diesel", "#000000"),
+    ("cargo", "sqlx", "SQLx", "database", "sqlx", "#000000"),
+    ("cargo", "wasm-bindgen", "WebAssembly", "runtime", "wasm", "#654FF0"),
+    ("cargo", "wasm-pack", "WebAssembly", "runtime", "wasm", "#654FF0"),
+    ("cargo", "yew", "Yew", "framework", "yew", "#009A5B"),
+    ("cargo", "leptos", "Leptos", "framework", "leptos", "#EF3939"),
+
+    # pub (pubspec.yaml)
+    ("pub", "firebase_core", "Firebase", "backend", "firebase", "#FFCA28"),
+    ("pub", "firebase_auth", "Firebase", "backend", "firebase", "#FFCA28"),
+    ("pub", "bloc", "BLoC", "state", "bloc", "#00B4AB"),
+    ("pub", "flutter_bloc", "BLoC", "state", "bloc", "#00B4AB"),
+    ("pub", "provider", "Provider", "state", "provider", "#FF7043"),
+    ("pub", "riverpod", "Riverpod", "state", "riverpod", "#00A0FF"),
+    ("pub", "flutter_riverpod", "Riverpod", "state", "riverpod", "#00A0FF"),
+    ("pub", "get", "GetX", "state", "getx", "#8E24AA"),
+    ("pub", "get_it", "GetX", "state", "getx", "#8E24AA"),
+    ("pub", "dio", "Dio", "http", "dio", "#1E88E5"),
+    ("pub", "http", "HTTP", "http", "http", "#4CAF50"),
+    ("pub", "hive", "Hive", "storage", "hive", "#FFC107"),
+    ("pub", "hive_flutter", "Hive", "storage", "hive", "#FFC107"),
+    ("pub", "shared_preferences", "SharedPreferences", "storage", "sharedpref", "#607D8B"),
+    ("pub", "sqflite", "SQLite", "database", "sqlite", "#003B57"),
+    ("pub", "drift", "Drift", "database", "drift", "#4E7EC1"),
+    ("pub", "moor", "Drift", "database", "drift", "#4E7EC1"),
+    ("pub", "go_router", "GoRouter", "routing", "gorouter", "#00BCD4"),
+    ("pub", "auto_route", "AutoRoute", "routing", "autoroute", "#9C27B0"),
+    ("pub", "freezed", "Freezed", "codegen", "freezed", "#00ACC1"),
+    ("pub", "json_serializable", "JSON Serializable", "codegen", "json", "#8BC34A"),
+    ("pub", "flutter_hooks", "Flutter Hooks", "ui", "hooks", "#3F51B5"),
+]
+
+
+def _compile(rules) -> dict[str, dict[str, tuple[int, TechInfo]]]:
+    """Build ecosystem -> dependency -> (rule rank, technology) lookups."""
+    index: dict[str, dict[str, tuple[int, TechInfo]]] = {}
+    for rank, (ecosystem, dependency, name, category, icon, color) in enumerate(rules):
+        tech = REGISTRY.register(name, category, icon, color)
+        index.setdefault(ecosystem, {}).setdefault(dependency, (rank, tech))
+    return index
+
+
+DEPENDENCY_INDEX = _compile(RULES)
+
+_PYPI_NAME_RE = re.compile(r"[-_.]+")
+
+
+def normalize_pypi(name: str) -> str:
+    """Normalize a Python package name (PEP 503)."""
+    return _PYPI_NAME_RE.sub("-", name).lower()
+
+
+def match_dependencies(ecosystem: str, dependencies: Iterable[str]) -> list[TechInfo]:
+    """Map parsed dependency names to technologies, in table order.
+
+    Costs one dict lookup per dependency; each technology is reported once.
+    """
+    index = DEPENDENCY_INDEX.get(ecosystem, {})
+    hits: dict[int, tuple[int, TechInfo]] = {}
+    for dependency in dependencies:
+        rule = index.get(dependency)
+        if rule is not None:
+            rank, tech = rule
+            if tech.id not in hits or rank < hits[tech.id][0]:
+                hits[tech.id] = rule
+    return [tech for _, tech in sorted(hits.values(), key=lambda rule: rule[0])]
+
+
+def match_go_modules(modules: Iterable[str]) -> list[TechInfo]:
+    """Map Go module paths to technologies.
+
+    A module matches a rule when the rule is the module path or one of its
+    parent paths, so gofiber/fiber/v2 matches github.com/gofiber/fiber.
+    """
+    candidates = []
+    for module in modules:
+        parts = module.lower().split("/")
+        candidates.extend("/".join(parts[:i]) for i in range(len(parts), 0, -1))
+    return match_dependencies("go", candidates)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex alternation factored on common prefixes.
+
+    Shared prefixes are written once, so the alternation stays small for
+    large indexes. Longer names are preferred at each branch.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile_scanners(index) -> dict[str, re.Pattern]:
+    """Compile one word-bounded multi-pattern matcher per ecosystem.
+
+    A match must not touch characters that continue a dependency name;
+    the lookahead only skips positions where no name can start.
+    """
+    scanners = {}
+    for ecosystem, deps in index.items():
+        first = re.escape("".join(sorted({dep[0] for dep in deps})))
+        scanners[ecosystem] = re.compile(
+            f"(?=[{first}])(?<![a-z0-9_-])({_trie_pattern(deps)})(?![a-z0-9_-])"
+        )
+    return scanners
+
+
+TEXT_SCANNERS = _compile_scanners(DEPENDENCY_INDEX)
+
+
+def scan_text(ecosystem: str, text: str) -> list[TechInfo]:
+    """Match an ecosystem's dependency names anywhere in free text.
+
+    Only the fallback for manifests that cannot be parsed (setup.py,
+    malformed TOML), kept for correctness rather than speed: names only
+    match as whole words, so "motor" does not match "promotor" as it did
+    with the substring scans this replaced (see benchmarks/bench_rules.py).
+    """
+    scanner = TEXT_SCANNERS.get(ecosystem)
+    if scanner is None:
+        return []
+    found = {match.group(1) for match in scanner.finditer(text.lower())}
+    return match_dependencies(ecosystem, found)
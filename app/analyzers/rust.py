@@ -1,84 +1,52 @@
-from .base import BaseAnalyzer, Technology
+import tomllib
+from .base import BaseAnalyzer, TechInfo
+from .files import RepoFiles
+from .rules import match_dependencies, scan_text
+
+DEPENDENCY_TABLES = ("dependencies", "dev-dependencies", "build-dependencies")
 
 
 class RustAnalyzer(BaseAnalyzer):
     """Analyzer for Rust projects."""
 
+    trigger_languages = frozenset({"Rust"})
+    lockfiles = ("Cargo.lock",)
+
     @property
     def files_to_check(self) -> list[str]:
         return ["Cargo.toml"]
 
-    async def analyze(
-        self,
-        owner: str,
-        repo: str,
-        github_client,
-    ) -> list[Technology]:
-        technologies = []
-
-        content = await github_client.get_file_content(owner, repo, "Cargo.toml")
-        if not content:
-            return technologies
-
-        content_lower = content.lower()
+    def analyze(self, files: RepoFiles) -> list[TechInfo]:
+        technologies = self._analyze_manifest(files, "Cargo.toml", self._parse)
+        return technologies or []
 
+    def _parse(self, content: str) -> list[TechInfo]:
         # Rust is being used
-        technologies.append(
-            self._create_tech("Rust", "language", "rust", "#DEA584")
-        )
-
-        # Web frameworks
-        if "actix-web" in content_lower:
-            technologies.append(
-                self._create_tech("Actix Web", "framework", "actix", "#000000")
-            )
-
-        if "rocket" in content_lower:
-            technologies.append(
-                self._create_tech("Rocket", "framework", "rocket", "#D33847")
-            )
-
-        if "axum" in content_lower:
-            technologies.append(
-                self._create_tech("Axum", "framework", "axum", "#000000")
-            )
+        technologies = [self._create_tech("Rust", "language", "rust", "#DEA584")]
 
-        if "warp" in content_lower:
-            technologies.append(
-                self._create_tech("Warp", "framework", "warp", "#000000")
-            )
-
-        # Async runtimes
-        if "tokio" in content_lower:
-            technologies.append(
-                self._create_tech("Tokio", "runtime", "tokio", "#000000")
-            )
-
-        # Database
-        if "diesel" in content_lower:
-            technologies.append(
-                self._create_tech("Diesel", "database", "diesel", "#000000")
-            )
-
-        if "sqlx" in content_lower:
-            technologies.append(
-                self._create_tech("SQLx", "database", "sqlx", "#000000")
-            )
-
-        # WASM
-        if "wasm-bindgen" in content_lower or "wasm-pack" in content_lower:
-            technologies.append(
-                self._create_tech("WebAssembly", "runtime", "wasm", "#654FF0")
-            )
-
-        if "yew" in content_lower:
-            technologies.append(
-                self._create_tech("Yew", "framework", "yew", "#009A5B")
-            )
-
-        if "leptos" in content_lower:
-            technologies.append(
-                self._create_tech("Leptos", "framework", "leptos", "#EF3939")
-            )
+        try:
+            manifest = tomllib.loads(content)
+        except tomllib.TOMLDecodeError:
+            technologies.extend(scan_text("cargo", content))
+            return technologies
 
+        technologies.extend(match_dependencies("cargo", self._dependency_names(manifest)))
         return technologies
+
+    def _dependency_names(self, manifest: dict) -> list[str]:
+        """Collect crate names from all dependency tables."""
+        tables = [manifest, manifest.get("workspace", {})]
+        tables.extend(manifest.get("target", {}).values())
+
+        names = []
+        for table in tables:
+            for key in DEPENDENCY_TABLES:
+                deps = table.get(key)
+                if isinstance(deps, dict):
+                    names.extend(deps)
+                    # Renamed crates: foo = { package = "actual-name" }
+                    names.extend(
+                        spec["package"] for spec in deps.values()
+                        if isinstance(spec, dict) and isinstance(spec.get("package"), str)
+                    )
+        return names
@@ -0,0 +1,81 @@
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+from .metrics import metrics
+
+# Breaker states, published as a gauge (higher is worse)
+CLOSED = 0  # Requests flow normally
+HALF_OPEN = 1  # One probe request tests whether the host recovered
+OPEN = 2  # Requests fail fast
+
+
+class CircuitBreaker:
+    """Fail fast while an upstream host is down.
+
+    After failure_threshold consecutive failures (network errors,
+    timeouts, 5xx) the breaker opens and allow() refuses requests, so
+    callers fall back to cached or degraded results at once instead of
+    waiting out timeouts. After reset_timeout seconds it lets one probe
+    through (half-open): success closes it, failure opens it again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._publish()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; report its outcome after."""
+        if self.state == CLOSED:
+            return True
+
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probe_started = None
+            self._publish()
+        # One probe at a time; a probe that never reported back is replaced
+        if self.state == HALF_OPEN and (
+            self._probe_started is None or now - self._probe_started >= self.reset_timeout
+        ):
+            self._probe_started = now
+            return True
+
+        metrics.incr(f"circuit_rejected_{self.name}")
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self._publish()
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self._failures >= self.failure_threshold
+        ):
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+            metrics.incr(f"circuit_opened_{self.name}")
+            self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"circuit_state_{self.name}", self.state)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """Get the shared breaker of a URL's host."""
+    host = urlsplit(url).hostname or url
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = CircuitBreaker(host)
+    return breaker
@@ -38,7 +38,7 @@ class TTLCache:
             self._stats.misses += 1
             return None
         if time.time() > entry.expires_at:
-            del self._cache[key]
+            # Kept for get_stale() until evicted or cleaned up
             self._stats.misses += 1
             return None
         # Move to end (most recently used)
@@ -46,10 +46,24 @@ class TTLCache:
         self._stats.hits += 1
         return entry.value
 
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Get a value even if it has expired (None if evicted).
+
+        Does not count as a hit or a miss.
+        """
+        entry = self._cache.get(key)
+        return entry.value if entry is not None else None
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until a key expires (negative once expired, None if absent)."""
+        entry = self._cache.get(key)
+        return entry.expires_at - time.time() if entry is not None else None
+
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         ttl = ttl or self._default_ttl
 
         # Remove oldest entries if cache is full
+        self._cache.pop(key, None)
         while len(self._cache) >= self._max_size:
             self._cache.popitem(last=False)
 
@@ -88,3 +102,5 @@ class TTLCache:
 # Global cache instances
 cache = TTLCache(default_ttl=3600, max_size=1000)  # API responses
 user_cache = TTLCache(default_ttl=1800, max_size=100)  # User analysis results (30 min)
+svg_cache = TTLCache(default_ttl=3600, max_size=500)  # Theme-independent SVG skeletons
+manifest_cache = TTLCache(default_ttl=86400, max_size=2000)  # Detections per manifest blob sha
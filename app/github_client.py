@@ -1,19 +1,133 @@
 import os
+import posixpath
+import time
+import asyncio
 import base64
+import random
 import httpx
-import asyncio
 import logging
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+from .breaker import breaker_for
 from .cache import cache
+from .hedging import MAX_CONCURRENT_HEDGES, Hedger
+from .limiter import AdaptiveLimiter
+from .metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+# Limits for streamed files (e.g. lockfiles)
+MAX_STREAM_BYTES = 50 * 1024 * 1024
+MAX_STREAM_LINE = 64 * 1024
+
+# Retries of failed GETs (network errors, timeouts, 5xx)
+MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.25  # seconds, doubled per retry, with full jitter
+RETRY_MAX_DELAY = 2.0
+ATTEMPT_TIMEOUT = 10.0  # seconds per attempt
+MIN_ATTEMPT_TIME = 0.5  # don't start an attempt with less time left
+
+# Cancellation message of requests whose result is no longer needed (a probe
+# that lost, a side fetch of a finished analysis), so they are not counted
+# as abandoned by a client
+SUPERSEDED = "superseded"
+
+# Monotonic time by which the current task's upstream requests must finish
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def use_deadline(seconds: float) -> Iterator[None]:
+    """Bound the upstream requests made inside the block to `seconds`.
+
+    Tasks created inside the block inherit the deadline; an enclosing
+    earlier deadline is kept.
+    """
+    deadline = time.monotonic() + seconds
+    current = request_deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+
+
+class GitHubUnavailable(Exception):
+    """GitHub could not answer: network errors, timeouts, 5xx responses
+    or rate limiting.
+
+    Unlike a 404 (None), this says nothing about whether the resource
+    exists, so callers must not read it as "absent".
+    """
+
+
+# Number of languages fetched per repo, largest first
+GRAPHQL_LANGUAGES_PER_REPO = 20
+
+REPOS_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(
+      first: $first
+      after: $after
+      isFork: false
+      ownerAffiliations: OWNER
+      orderBy: {field: STARGAZERS, direction: DESC}
+    ) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        stargazerCount
+        isFork
+        isArchived
+        isTemplate
+        pushedAt
+        diskUsage
+        languages(first: %d, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+      }
+    }
+  }
+}
+""" % GRAPHQL_LANGUAGES_PER_REPO
+
+
+def _repo_from_graphql(node: dict) -> dict:
+    """Convert a GraphQL repository node to the REST listing shape."""
+    return {
+        "name": node["name"],
+        "stargazers_count": node.get("stargazerCount", 0),
+        "fork": node.get("isFork", False),
+        "archived": node.get("isArchived", False),
+        "is_template": node.get("isTemplate", False),
+        "pushed_at": node.get("pushedAt"),
+        "size": node.get("diskUsage"),
+        "languages": {
+            edge["node"]["name"]: edge["size"]
+            for edge in (node.get("languages") or {}).get("edges", [])
+        },
+    }
+
 
 class GitHubClient:
-    """Async GitHub API client with connection pooling and concurrency control."""
+    """Async GitHub API client with connection pooling and concurrency control.
+
+    Concurrency starts at MAX_CONCURRENT_REQUESTS and adapts between
+    MIN_CONCURRENT_REQUESTS and MAX_CONCURRENT_REQUESTS_LIMIT (see
+    limiter.AdaptiveLimiter); the connection pool is sized to match.
+    While GitHub is down, a circuit breaker per host fails requests fast
+    (see breaker.CircuitBreaker).
+    """
 
     BASE_URL = "https://api.github.com"
-    MAX_CONCURRENT_REQUESTS = 10  # Limit concurrent requests to avoid rate limiting
+    GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+    MAX_CONCURRENT_REQUESTS = 10  # Initial limit on concurrent requests
+    MIN_CONCURRENT_REQUESTS = 2
+    MAX_CONCURRENT_REQUESTS_LIMIT = 40
 
     def __init__(self, token: Optional[str] = None):
         self.token = token or os.getenv("GITHUB_TOKEN")
@@ -23,9 +137,15 @@ class GitHubClient:
         }
         if self.token:
             self.headers["Authorization"] = f"token {self.token}"
-        self._rate_limited = False
+        self._rate_limited_until: dict[str, float] = {}  # bucket -> reset time
+        self._rate_limit_headroom: dict[str, float] = {}  # bucket -> share left
         self._client: Optional[httpx.AsyncClient] = None
-        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._limiter = AdaptiveLimiter(
+            initial=self.MAX_CONCURRENT_REQUESTS,
+            min_limit=self.MIN_CONCURRENT_REQUESTS,
+            max_limit=self.MAX_CONCURRENT_REQUESTS_LIMIT,
+        )
+        self._hedger = Hedger("github")  # Only for GETs, which are idempotent
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create a shared HTTP client."""
@@ -33,7 +153,12 @@ class GitHubClient:
             self._client = httpx.AsyncClient(
                 headers=self.headers,
                 timeout=10.0,
-                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+                # The limiter never has more requests in flight than its
+                # maximum, plus hedged duplicates
+                limits=httpx.Limits(
+                    max_connections=self._limiter.max_limit + MAX_CONCURRENT_HEDGES,
+                    max_keepalive_connections=self._limiter.max_limit,
+                ),
             )
         return self._client
 
@@ -43,37 +168,333 @@ class GitHubClient:
             await self._client.aclose()
             self._client = None
 
-    async def _request(self, endpoint: str) -> Optional[dict | list]:
-        # Skip requests if we're rate limited
-        if self._rate_limited:
-            return None
+    @staticmethod
+    def _is_rate_limit(response: httpx.Response) -> bool:
+        """Whether a response refuses a request for exceeding a rate limit.
 
-        cache_key = f"github:{endpoint}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+        Other 403s (a blocked or private resource) are plain refusals.
+        """
+        if response.status_code == 429:
+            return True
+        return response.status_code == 403 and (
+            response.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in response.headers
+        )
 
-        async with self._semaphore:  # Limit concurrent requests
-            client = await self._get_client()
+    @classmethod
+    def _is_overload(cls, response: httpx.Response) -> bool:
+        """Whether a response means GitHub wants us to slow down."""
+        return response.status_code >= 500 or cls._is_rate_limit(response)
+
+    def _is_rate_limited(self, bucket: str) -> bool:
+        until = self._rate_limited_until.get(bucket)
+        if until is None:
+            return False
+        if time.time() >= until:
+            del self._rate_limited_until[bucket]
+            return False
+        return True
+
+    def _note_rate_limit(self, bucket: str, response: httpx.Response) -> None:
+        try:
+            remaining = int(response.headers["X-RateLimit-Remaining"])
+            limit = int(response.headers["X-RateLimit-Limit"])
+        except (KeyError, ValueError):
+            return
+        if limit > 0:
+            self._rate_limit_headroom[bucket] = remaining / limit
+
+    def rate_limit_headroom(self, bucket: str = "core") -> Optional[float]:
+        """Share of a bucket's rate limit left (None until a response told us)."""
+        if self._is_rate_limited(bucket):
+            return 0.0
+        return self._rate_limit_headroom.get(bucket)
+
+    def _set_rate_limited(self, bucket: str, response: httpx.Response) -> None:
+        # Secondary rate limits say how long to wait; primary ones when they reset
+        try:
+            until = time.time() + float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
             try:
-                response = await client.get(f"{self.BASE_URL}{endpoint}")
+                until = float(response.headers["X-RateLimit-Reset"])
+            except (KeyError, ValueError):
+                until = time.time() + 60
+        self._rate_limited_until[bucket] = until
+        logger.warning(f"GitHub API rate limit exceeded ({bucket})")
+
+    @staticmethod
+    def _attempt_timeout() -> float:
+        """Timeout for the next attempt, bounded by the request deadline."""
+        deadline = request_deadline.get()
+        if deadline is None:
+            return ATTEMPT_TIMEOUT
+        remaining = deadline - time.monotonic()
+        if remaining < MIN_ATTEMPT_TIME:
+            raise GitHubUnavailable("request deadline exceeded")
+        return min(ATTEMPT_TIMEOUT, remaining)
+
+    @staticmethod
+    async def _backoff(attempt: int) -> None:
+        """Sleep before retry number `attempt` (1-based), within the deadline."""
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1)))
+        deadline = request_deadline.get()
+        if deadline is not None and time.monotonic() + delay + MIN_ATTEMPT_TIME > deadline:
+            raise GitHubUnavailable("request deadline exceeded")
+        metrics.incr("github_retries")
+        await asyncio.sleep(delay)
+
+    async def _request(
+        self, endpoint: str, bucket: str = "core", cached: bool = True
+    ) -> Optional[dict | list]:
+        """GET an endpoint with caching and retries.
+
+        Network errors, timeouts and 5xx responses are retried up to
+        MAX_ATTEMPTS times with jittered exponential backoff, each attempt
+        bounded by ATTEMPT_TIMEOUT and the request deadline (see
+        use_deadline).
+
+        Args:
+            bucket: Rate limit bucket of the endpoint; the search API is
+                limited separately from everything else ("core")
+            cached: Use the response cache; large responses the caller
+                condenses are cached by the caller instead
+
+        Returns:
+            The decoded response, or None if the resource does not exist
+            (404) or the request was refused (other 4xx)
+
+        Raises:
+            GitHubUnavailable: GitHub is rate limiting us or did not answer
+                within the retries and deadline
+        """
+        cache_key = f"github:{endpoint}" if cached else None
+        if cache_key is not None:
+            data = cache.get(cache_key)
+            if data is not None:
+                return data
+
+        try:
+            return await self._request_with_retries(endpoint, bucket, cache_key)
+        except asyncio.CancelledError as e:
+            if e.args == (SUPERSEDED,):
+                metrics.incr("github_requests_superseded")
+            else:
+                # The caller went away (e.g. the client disconnected)
+                metrics.incr("github_requests_cancelled")
+            raise
+
+    async def _request_with_retries(
+        self, endpoint: str, bucket: str, cache_key: Optional[str]
+    ) -> Optional[dict | list]:
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt:
+                await self._backoff(attempt)
+            # Skip requests if we're rate limited
+            if self._is_rate_limited(bucket):
+                raise GitHubUnavailable(f"rate limited ({bucket})")
+            breaker = breaker_for(self.BASE_URL)
+            if not breaker.allow():
+                raise GitHubUnavailable(f"circuit open ({breaker.name})")
+            timeout = self._attempt_timeout()
+
+            async with self._limiter.slot() as slot:  # Limit concurrent requests
+                client = await self._get_client()
+                try:
+                    # httpx timeouts are per operation; this bounds the whole attempt
+                    response = await asyncio.wait_for(
+                        self._hedger.run(lambda: client.get(f"{self.BASE_URL}{endpoint}")),
+                        timeout,
+                    )
+                except (httpx.RequestError, asyncio.TimeoutError) as e:
+                    # A timeout cut short by the deadline says nothing about GitHub
+                    if isinstance(e, asyncio.TimeoutError) and timeout < ATTEMPT_TIMEOUT:
+                        slot.measure = False
+                    else:
+                        slot.overloaded = True
+                        breaker.record_failure()
+                    error = f"{type(e).__name__}: {e}"
+                    logger.warning(f"GitHub API request error ({error}), attempt {attempt + 1}: {endpoint}")
+                    continue
+
+                slot.overloaded = self._is_overload(response)
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                self._note_rate_limit(bucket, response)
                 if response.status_code == 200:
                     data = response.json()
-                    cache.set(cache_key, data)
+                    if cache_key is not None:
+                        cache.set(cache_key, data)
                     return data
-                elif response.status_code == 403:
-                    # Rate limited
-                    self._rate_limited = True
-                    logger.warning("GitHub API rate limit exceeded")
-                    return None
+                elif self._is_rate_limit(response):
+                    # Rate limited until the bucket resets
+                    self._set_rate_limited(bucket, response)
+                    raise GitHubUnavailable(f"rate limited ({bucket})")
                 elif response.status_code == 404:
                     # Cache 404s briefly to avoid repeated lookups
-                    cache.set(cache_key, None, ttl=300)
+                    if cache_key is not None:
+                        cache.set(cache_key, None, ttl=300)
                     return None
+                elif response.status_code < 500:
+                    return None
+                error = f"HTTP {response.status_code}"
+                logger.warning(f"GitHub API {error}, attempt {attempt + 1}: {endpoint}")
+
+        metrics.incr("github_requests_failed")
+        logger.error(f"GitHub API request failed after {MAX_ATTEMPTS} attempts ({error}): {endpoint}")
+        raise GitHubUnavailable(f"{endpoint}: {error}")
+
+    async def _graphql(self, query: str, variables: dict) -> Optional[dict]:
+        """POST a GraphQL query and return its data (None on any error)."""
+        # GraphQL requires authentication and has its own rate limit
+        if not self.token or self._is_rate_limited("graphql"):
+            return None
+        breaker = breaker_for(self.GRAPHQL_URL)
+        if not breaker.allow():
+            return None
+
+        async with self._limiter.slot() as slot:  # Limit concurrent requests
+            client = await self._get_client()
+            try:
+                response = await client.post(
+                    self.GRAPHQL_URL, json={"query": query, "variables": variables}
+                )
+                slot.overloaded = self._is_overload(response)
+            except httpx.RequestError as e:
+                slot.overloaded = True
+                breaker.record_failure()
+                logger.error(f"GitHub GraphQL request error: {e}")
                 return None
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if self._is_rate_limit(response):
+            self._set_rate_limited("graphql", response)
+            return None
+        if response.status_code != 200:
+            return None
+        payload = response.json()
+        if payload.get("errors"):
+            logger.warning(f"GitHub GraphQL errors: {payload['errors']}")
+            return None
+        return payload.get("data")
+
+    async def get_user_repos_graphql(
+        self, username: str, limit: int = 30
+    ) -> Optional[list[dict]]:
+        """Get a user's top non-fork repos by stars, with language sizes.
+
+        One paginated GraphQL query returns what the REST listing does plus
+        each repo's languages breakdown, so no per-repo /languages call is
+        needed. Repos are returned in the REST shape with an extra
+        "languages" dict. Returns None if GraphQL is unavailable.
+        """
+        cache_key = f"graphql:repos:{username}:{limit}"
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        repos = []
+        cursor = None
+        while len(repos) < limit:
+            data = await self._graphql(
+                REPOS_QUERY,
+                {"login": username, "first": min(limit - len(repos), 100), "after": cursor},
+            )
+            if data is None:
+                return None
+            owner = data.get("repositoryOwner")
+            if owner is None:
+                break  # No such user or organization
+            page = owner["repositories"]
+            repos.extend(_repo_from_graphql(node) for node in page["nodes"])
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            cursor = page["pageInfo"]["endCursor"]
+
+        cache.set(cache_key, repos)
+        return repos
+
+    async def stream_file_lines(
+        self,
+        owner: str,
+        repo: str,
+        path: str,
+        max_bytes: int = MAX_STREAM_BYTES,
+        max_line: int = MAX_STREAM_LINE,
+    ) -> AsyncIterator[str]:
+        """Stream a file's raw content line by line.
+
+        The body is never held in memory as a whole: lines longer than
+        max_line are skipped, and reading stops after max_bytes. Streamed
+        contents bypass the response cache; only 404s are cached. Yields
+        nothing if the file does not exist or the request was refused.
+
+        Raises:
+            GitHubUnavailable: GitHub is rate limiting us, failed or broke
+                off the stream, so the lines yielded may be incomplete
+        """
+        cache_key = f"github:missing:/repos/{owner}/{repo}/contents/{path}"
+        if cache.get(cache_key):
+            return
+        if self._is_rate_limited("core"):
+            raise GitHubUnavailable("rate limited (core)")
+        breaker = breaker_for(self.BASE_URL)
+        if not breaker.allow():
+            raise GitHubUnavailable(f"circuit open ({breaker.name})")
+
+        url = f"{self.BASE_URL}/repos/{owner}/{repo}/contents/{path}"
+        # A stream's duration reflects file size, not upstream health
+        async with self._limiter.slot(measure=False) as slot:
+            client = await self._get_client()
+            try:
+                async with client.stream(
+                    "GET", url, headers={"Accept": "application/vnd.github.raw"}
+                ) as response:
+                    slot.overloaded = self._is_overload(response)
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    if self._is_rate_limit(response):
+                        self._set_rate_limited("core", response)
+                        raise GitHubUnavailable("rate limited (core)")
+                    if response.status_code >= 500:
+                        raise GitHubUnavailable(f"{path}: HTTP {response.status_code}")
+                    if response.status_code == 404:
+                        cache.set(cache_key, True, ttl=300)
+                    if response.status_code != 200:
+                        return
+
+                    buffer = ""
+                    received = 0
+                    skipping = False  # Inside an overlong line
+                    async for chunk in response.aiter_text():
+                        received += len(chunk)
+                        lines = (buffer + chunk).split("\n")
+                        buffer = lines.pop()
+                        for line in lines:
+                            if skipping:
+                                skipping = False
+                                continue
+                            yield line
+                        if len(buffer) > max_line:
+                            buffer = ""
+                            skipping = True
+                        if received > max_bytes:
+                            logger.warning(f"Stopped streaming {owner}/{repo}/{path} at {received} bytes")
+                            return
+                    if buffer and not skipping:
+                        yield buffer
             except httpx.RequestError as e:
+                slot.overloaded = True
+                breaker.record_failure()
                 logger.error(f"GitHub API request error: {e}")
-                return None
+                raise GitHubUnavailable(f"{path}: {type(e).__name__}: {e}") from e
 
     async def get_user_repos(self, username: str, per_page: int = 100) -> list[dict]:
         """Get all public repos for a user."""
@@ -91,24 +512,75 @@ class GitHubClient:
             page += 1
         return repos
 
+    async def search_user_repos(
+        self, username: str, limit: int = 30
+    ) -> Optional[list[dict]]:
+        """Get a user's top non-fork repos by stars from the search API.
+
+        Returns None if the search failed, was rate limited or returned
+        incomplete results, so callers can fall back to listing.
+        """
+        per_page = max(1, min(limit, 100))
+        try:
+            data = await self._request(
+                f"/search/repositories?q=user:{username}+fork:false"
+                f"&sort=stars&order=desc&per_page={per_page}",
+                bucket="search",
+            )
+        except GitHubUnavailable:
+            return None
+        if not isinstance(data, dict) or data.get("incomplete_results"):
+            return None
+        return data.get("items", [])
+
+    async def get_top_user_repos(self, username: str, limit: int = 30) -> list[dict]:
+        """Get about the top `limit` repos for a user.
+
+        Tries, in order: GraphQL (which also returns language sizes), the
+        search API (top repos by stars in one request), and listing every
+        repo the user owns.
+        """
+        repos = await self.get_user_repos_graphql(username, limit)
+        if repos is not None:
+            metrics.incr("repo_listing_graphql")
+            return repos
+        repos = await self.search_user_repos(username, limit)
+        if repos is not None:
+            metrics.incr("repo_listing_search")
+            return repos
+        metrics.incr("repo_listing_fallback")
+        return await self.get_user_repos(username)
+
     async def get_repo_contents(
         self, owner: str, repo: str, path: str = ""
     ) -> Optional[list[dict] | dict]:
         """Get contents of a repo directory or file."""
         return await self._request(f"/repos/{owner}/{repo}/contents/{path}")
 
-    async def get_file_content(
+    async def get_file_blob(
         self, owner: str, repo: str, path: str
-    ) -> Optional[str]:
-        """Get decoded content of a file."""
+    ) -> Optional[dict]:
+        """Get the contents entry of a file, including its blob sha."""
         data = await self._request(f"/repos/{owner}/{repo}/contents/{path}")
         if data and isinstance(data, dict) and "content" in data:
-            try:
-                return base64.b64decode(data["content"]).decode("utf-8")
-            except Exception:
-                return None
+            return data
         return None
 
+    @staticmethod
+    def decode_content(blob: dict) -> Optional[str]:
+        """Decode the base64 content of a file entry."""
+        try:
+            return base64.b64decode(blob["content"]).decode("utf-8")
+        except Exception:
+            return None
+
+    async def get_file_content(
+        self, owner: str, repo: str, path: str
+    ) -> Optional[str]:
+        """Get decoded content of a file."""
+        blob = await self.get_file_blob(owner, repo, path)
+        return self.decode_content(blob) if blob else None
+
     async def check_file_exists(
         self, owner: str, repo: str, path: str
     ) -> bool:
@@ -125,6 +597,34 @@ class GitHubClient:
             return [item["name"] for item in data if item["type"] == "file"]
         return []
 
+    async def get_repo_tree(
+        self, owner: str, repo: str, names: frozenset[str]
+    ) -> list[dict]:
+        """Get the files of the default branch with one of some names.
+
+        One recursive tree listing is fetched; only the matching blobs
+        ({"path", "type", "sha"}) are kept and cached, since the full
+        tree of a large repository runs to megabytes. Very large trees
+        come back truncated; the entries returned are still usable.
+        """
+        cache_key = f"github:tree:{owner}/{repo}:{','.join(sorted(names))}"
+        entries = cache.get(cache_key)
+        if entries is not None:
+            return entries
+
+        data = await self._request(
+            f"/repos/{owner}/{repo}/git/trees/HEAD?recursive=1", cached=False
+        )
+        tree = data.get("tree", []) if data and isinstance(data, dict) else []
+        entries = [
+            {"path": entry["path"], "type": "blob", "sha": entry.get("sha")}
+            for entry in tree
+            if entry.get("type") == "blob"
+            and posixpath.basename(entry.get("path", "")) in names
+        ]
+        cache.set(cache_key, entries)
+        return entries
+
     async def get_repo_languages(
         self, owner: str, repo: str
     ) -> dict[str, int]:
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+from .metrics import metrics
+
+T = TypeVar("T")
+
+# Send a duplicate of idempotent reads that are slower than usual
+HEDGING_ENABLED = os.getenv("REQUEST_HEDGING", "").lower() in ("1", "true", "yes")
+# Hedges allowed per request, on average
+HEDGE_BUDGET = 0.05
+# Duplicates in flight at once, per Hedger
+MAX_CONCURRENT_HEDGES = 4
+
+
+class Hedger:
+    """Hedge slow reads: duplicate a request that outlives recent latency.
+
+    A request still running after the `quantile` percentile of recent
+    latencies is sent again, and whichever copy succeeds first wins; the
+    other is cancelled. Each request earns `budget` of a hedge (up to a
+    burst of `max_tokens`), so duplicates stay within that share of
+    traffic. Latencies are published as the `<name>_latency` summary.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        quantile: float = 95,
+        budget: float = HEDGE_BUDGET,
+        max_tokens: float = 5.0,
+        min_samples: int = 50,
+    ):
+        self.name = name
+        self.quantile = quantile
+        self.budget = budget
+        self.max_tokens = max_tokens
+        self.min_samples = min_samples
+        self._tokens = 0.0
+        self._outstanding = 0
+        self._samples = 0
+        self._delay: Optional[float] = None
+
+    def _observe(self, latency: float) -> None:
+        metrics.observe(f"{self.name}_latency", latency)
+        self._samples += 1
+        # Sorting the window on every request is wasteful; refresh now and then
+        if self._samples >= self.min_samples and self._samples % 20 == 0:
+            self._delay = metrics.percentile(f"{self.name}_latency", self.quantile)
+
+    async def _timed(self, fetch: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            # The losing copy was at least this slow; dropping it would
+            # leave only the fast responses and shrink the hedge delay
+            self._observe(time.monotonic() - start)
+            raise
+        self._observe(time.monotonic() - start)
+        return result
+
+    def _take_token(self) -> bool:
+        if self._tokens < 1 or self._outstanding >= MAX_CONCURRENT_HEDGES:
+            return False
+        self._tokens -= 1
+        return True
+
+    async def run(self, fetch: Callable[[], Awaitable[T]]) -> T:
+        """Await fetch(), calling it a second time if the first is slow.
+
+        fetch must be safe to call twice (an idempotent read).
+        """
+        if not HEDGING_ENABLED:
+            return await fetch()
+
+        self._tokens = min(self.max_tokens, self._tokens + self.budget)
+        first = asyncio.ensure_future(self._timed(fetch))
+        second = None
+        try:
+            if self._delay is not None:
+                done, _ = await asyncio.wait({first}, timeout=self._delay)
+                if not done and self._take_token():
+                    metrics.incr(f"{self.name}_hedges")
+                    self._outstanding += 1
+                    second = asyncio.ensure_future(self._timed(fetch))
+            if second is None:
+                return await first
+
+            pending = {first, second}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            metrics.incr(f"{self.name}_hedge_wins")
+                        return task.result()
+                if not pending:
+                    return done.pop().result()  # Both failed: raise
+        finally:
+            first.cancel()
+            if second is not None:
+                second.cancel()
+                self._outstanding -= 1
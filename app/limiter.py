@@ -0,0 +1,285 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from .metrics import metrics
+
+# Priority classes of upstream work, most urgent first
+INTERACTIVE = 0  # Live requests someone is waiting on
+BACKGROUND = 1  # Refreshes, prewarming, batch jobs
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Priority of the upstream requests made by the current task
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+# Fairness key of the current task's upstream requests (e.g. the username)
+request_flow: ContextVar[str] = ContextVar("request_flow", default="")
+
+# Share of grants background work gets while interactive work is queued
+BACKGROUND_MIN_SHARE = 0.1
+
+
+@contextmanager
+def use_priority(priority: int) -> Iterator[None]:
+    """Run upstream requests made inside the block at a priority.
+
+    Tasks created inside the block inherit it.
+    """
+    token = request_priority.set(priority)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+@contextmanager
+def use_flow(flow: str) -> Iterator[None]:
+    """Queue upstream requests made inside the block fairly under a key.
+
+    Tasks created inside the block inherit it.
+    """
+    token = request_flow.set(flow)
+    try:
+        yield
+    finally:
+        request_flow.reset(token)
+
+
+# Assumed round trip until latencies have been measured (seconds)
+DEFAULT_ROUND_TRIP = 1.0
+
+
+class FairQueue:
+    """Deficit round robin over per-flow FIFO queues.
+
+    Each flow with waiters earns `quantum` grants per round, so a flow
+    with hundreds of queued requests cannot delay a flow with a few by
+    more than one round.
+    """
+
+    def __init__(self, quantum: float = 1.0):
+        self.quantum = quantum
+        self._flows: OrderedDict[str, deque[asyncio.Future]] = OrderedDict()
+        self._deficits: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._flows.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._flows)
+
+    def append(self, flow: str, waiter: asyncio.Future) -> None:
+        if flow not in self._flows:
+            self._flows[flow] = deque()
+            self._deficits[flow] = 0.0
+        self._flows[flow].append(waiter)
+
+    def remove(self, flow: str, waiter: asyncio.Future) -> None:
+        """Remove a waiter, unless it was already popped."""
+        queue = self._flows.get(flow)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        if not queue:
+            del self._flows[flow]
+            del self._deficits[flow]
+
+    def popleft(self) -> asyncio.Future:
+        """Pop the next waiter; each request costs one unit of deficit."""
+        while True:
+            flow, queue = next(iter(self._flows.items()))
+            if self._deficits[flow] < 1:
+                self._deficits[flow] += self.quantum
+                if self._deficits[flow] < 1:
+                    self._flows.move_to_end(flow)
+                    continue
+
+            self._deficits[flow] -= 1
+            waiter = queue.popleft()
+            if not queue:
+                # Idle flows do not bank credit
+                del self._flows[flow]
+                del self._deficits[flow]
+            elif self._deficits[flow] < 1:
+                self._flows.move_to_end(flow)
+            return waiter
+
+
+class Slot:
+    """One granted unit of upstream concurrency.
+
+    Use as an async context manager; set `overloaded` when the upstream
+    pushed back (rate limit, 5xx, timeout) so the limiter can back off,
+    and clear `measure` when the request's latency says nothing about
+    the upstream (e.g. it was cut short by a deadline).
+    """
+
+    def __init__(self, limiter: "AdaptiveLimiter", measure: bool):
+        self._limiter = limiter
+        self.measure = measure
+        self._start = 0.0
+        self.overloaded = False
+
+    async def __aenter__(self) -> "Slot":
+        await self._limiter.acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and issubclass(exc_type, asyncio.TimeoutError):
+            self.overloaded = True
+        latency = time.monotonic() - self._start if self.measure else None
+        self._limiter.release(latency, self.overloaded)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that adapts to upstream health (AIMD).
+
+    Every healthy response raises the limit by 1/limit, i.e. by one per
+    round of requests. A rate limit, a server error, a timeout or latency
+    inflation (short-term average latency above latency_tolerance times
+    the long-term average, and at least min_latency_increase seconds
+    above it, so jitter on fast responses does not count) multiplies it
+    by `backoff`, at most once per average round trip so one burst of
+    failures counts once.
+
+    When all slots are taken, requests wait in one queue per priority
+    class (see request_priority). Freed slots go to the most urgent
+    class, except that background work is guaranteed
+    BACKGROUND_MIN_SHARE of grants so it cannot starve. Within a class,
+    flows (see request_flow) are served fairly by a FairQueue.
+    """
+
+    def __init__(
+        self,
+        initial: int = 10,
+        min_limit: int = 2,
+        max_limit: int = 40,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_latency_increase: float = 0.05,
+        name: str = "upstream",
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.min_latency_increase = min_latency_increase
+        self.name = name
+
+        self._in_flight = 0
+        self._queues: dict[int, FairQueue] = {
+            priority: FairQueue() for priority in PRIORITY_NAMES
+        }
+        self._urgent_streak = 0  # Grants to other classes while background waited
+        # Short- and long-term moving averages of latency
+        self._short: Optional[float] = None
+        self._long: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = 0.0
+        self._publish()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def slot(self, measure: bool = True) -> Slot:
+        """Acquire a slot for one request.
+
+        Args:
+            measure: Feed the request's latency into the limit (disable for
+                long streams whose duration says nothing about health)
+        """
+        return Slot(self, measure)
+
+    def _waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def acquire(self) -> None:
+        if self._in_flight < int(self.limit) and not self._waiting():
+            self._in_flight += 1
+            self._publish()
+            return
+
+        priority = request_priority.get()
+        flow = request_flow.get()
+        queue = self._queues[priority]
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(flow, waiter)
+        enqueued = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we were cancelled: hand the slot on
+                self._in_flight -= 1
+                self._wake()
+            else:
+                # _wake() may already have popped (and skipped) the waiter
+                queue.remove(flow, waiter)
+            raise
+        metrics.observe(f"{self.name}_queue_wait_{PRIORITY_NAMES[priority]}", time.monotonic() - enqueued)
+
+    def release(self, latency: Optional[float] = None, overloaded: bool = False) -> None:
+        self._in_flight -= 1
+        self._adjust(latency, overloaded)
+        self._wake()
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Pop the waiter to grant next, by priority with a background share."""
+        background = self._queues[BACKGROUND]
+        streak_limit = round(1 / BACKGROUND_MIN_SHARE) - 1
+        if background and self._urgent_streak >= streak_limit:
+            self._urgent_streak = 0
+            return background.popleft()
+
+        for priority, queue in self._queues.items():
+            if queue:
+                if priority == BACKGROUND:
+                    self._urgent_streak = 0
+                elif background:
+                    self._urgent_streak += 1
+                return queue.popleft()
+        return None
+
+    def _wake(self) -> None:
+        while self._in_flight < int(self.limit):
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+        self._publish()
+
+    def _adjust(self, latency: Optional[float], overloaded: bool) -> None:
+        if not overloaded and latency is not None:
+            if self._short is None:
+                self._short = self._long = latency
+            self._short = 0.8 * self._short + 0.2 * latency
+            self._long = 0.99 * self._long + 0.01 * latency
+            self._samples += 1
+            if (
+                self._samples >= 20
+                and self._short > self.latency_tolerance * self._long
+                and self._short - self._long >= self.min_latency_increase
+            ):
+                overloaded = True
+
+        if overloaded:
+            now = time.monotonic()
+            round_trip = self._long if self._long is not None else DEFAULT_ROUND_TRIP
+            if now - self._last_decrease >= round_trip:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+                metrics.incr(f"{self.name}_limit_decreases")
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"{self.name}_concurrency_limit", int(self.limit))
+        metrics.set_gauge(f"{self.name}_in_flight", self._in_flight)
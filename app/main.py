@@ -1,17 +1,24 @@
-from fastapi import FastAPI, Response, Query
+from fastapi import FastAPI, Request, Response, Query
 from fastapi.responses import HTMLResponse
-from typing import Optional
+from typing import Awaitable, Callable, Optional, TypeVar
 from dotenv import load_dotenv
+import os
 import asyncio
+from array import array
 
 load_dotenv()
 
-from .github_client import GitHubClient
-from .analyzers import ALL_ANALYZERS
+from .github_client import GitHubClient, GitHubUnavailable, use_deadline
+from .analyzers import run_analyzers
 from .analyzers.base import Technology
+from .analyzers.profile import Completeness, TechProfile
 from .svg.generator import SVGGenerator
 from .svg.icons import fetch_icons
-from .cache import cache, user_cache
+from .cache import cache, user_cache, svg_cache, manifest_cache
+from .metrics import metrics
+from .limiter import request_priority, use_flow
+from .refresher import REFRESH_ENABLED, Refresher
+from .selection import ANALYZERS_BY_DEPTH, FULL, select_repos
 
 app = FastAPI(
     title="GitHub Tech Stack Analyzer",
@@ -21,62 +28,229 @@ app = FastAPI(
 
 github = GitHubClient()
 svg_generator = SVGGenerator()
+refresher = Refresher(user_cache, github.rate_limit_headroom)
+
+# Upstream requests for one card must finish within this many seconds
+REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "25"))
+# Profiles missing some repos, or served stale, are cached this long, in seconds
+INCOMPLETE_PROFILE_TTL = 60
+# How often to check whether the client is still waiting, in seconds
+DISCONNECT_POLL_INTERVAL = 0.5
+
+T = TypeVar("T")
+
+# Analyses in progress: cache key -> [task, number of waiters, priority started at]
+_analyses: dict[str, list] = {}
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Start refreshing hot profiles in the background, if enabled."""
+    if REFRESH_ENABLED:
+        refresher.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close HTTP client on shutdown."""
+    """Stop background work and close HTTP client on shutdown."""
+    await refresher.stop()
     await github.close()
 
 
+@app.exception_handler(GitHubUnavailable)
+async def github_unavailable_handler(request, exc: GitHubUnavailable):
+    """Fail visibly instead of rendering a card from missing data."""
+    return Response(
+        content="GitHub is temporarily unavailable, try again later",
+        status_code=503,
+        headers={"Cache-Control": "no-store", "Retry-After": "60"},
+    )
+
+
 async def analyze_repo(
-    owner: str, repo: str, github_client: GitHubClient
-) -> list[Technology]:
-    """Analyze a single repository with all analyzers."""
-    tasks = [analyzer.analyze(owner, repo, github_client) for analyzer in ALL_ANALYZERS]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    owner: str,
+    repo: str,
+    github_client: GitHubClient,
+    depth: str = FULL,
+    languages: Optional[dict[str, int]] = None,
+) -> array:
+    """Analyze a single repository with the analyzers for a depth.
+
+    Args:
+        languages: Languages breakdown if already known from the listing
+
+    Returns the detected technology ids (see analyzers.registry).
+    """
+    analyzers = ANALYZERS_BY_DEPTH[depth]
+    technologies = await run_analyzers(owner, repo, github_client, analyzers, languages)
+    return array("H", (tech.id for tech in technologies))
 
-    technologies = []
-    for result in results:
-        if isinstance(result, list):
-            technologies.extend(result)
 
-    return technologies
+async def _settle(awaitable: Awaitable[T]) -> T | Exception:
+    """Await something, returning its exception instead of raising it."""
+    try:
+        return await awaitable
+    except Exception as e:
+        return e
 
 
-async def analyze_user(username: str, max_repos: int = 30) -> list[Technology]:
+async def _join_analysis(key: str, start: Callable[[], Awaitable[T]]) -> T:
+    """Wait for the analysis under a key, starting it if none is running.
+
+    Concurrent callers share one analysis. It is cancelled as soon as no
+    caller waits for it any more (e.g. all clients disconnected). A
+    caller never joins an analysis started at a lower priority (a live
+    request finding a background refresh running): it starts its own,
+    which later callers join, instead of waiting behind the refresh's
+    queued upstream requests.
+    """
+    priority = request_priority.get()
+    entry = _analyses.get(key)
+    if entry is None or priority < entry[2]:
+        task = asyncio.ensure_future(start())
+        entry = _analyses[key] = [task, 0, priority]
+        task.add_done_callback(
+            lambda _: _analyses.pop(key) if _analyses.get(key) is entry else None
+        )
+    else:
+        metrics.incr("analyses_joined")
+
+    entry[1] += 1
+    try:
+        return await asyncio.shield(entry[0])
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0 and not entry[0].done():
+            metrics.incr("analyses_cancelled")
+            entry[0].cancel()
+            # A new caller must start afresh, not join the cancelled task
+            if _analyses.get(key) is entry:
+                del _analyses[key]
+
+
+async def analyze_user(
+    username: str, max_repos: int = 30, refresh: bool = False
+) -> TechProfile:
     """Analyze repositories for a user in parallel with caching.
 
+    Concurrent calls for the same user share one analysis (see
+    _join_analysis).
+
     Args:
         username: GitHub username
-        max_repos: Maximum number of repos to analyze (sorted by stars)
+        max_repos: Maximum number of repos to analyze (see selection.select_repos)
+        refresh: Re-analyze even if a cached profile is still fresh
     """
-    # Check user cache first
     cache_key = f"user:{username}:{max_repos}"
-    cached = user_cache.get(cache_key)
-    if cached is not None:
-        return cached
+    if not refresh:
+        if REFRESH_ENABLED:
+            refresher.record(
+                cache_key, lambda: analyze_user(username, max_repos, refresh=True)
+            )
+        # Check user cache first
+        cached = user_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    return await _join_analysis(
+        cache_key, lambda: _analyze_user(username, max_repos, cache_key)
+    )
+
+
+async def _analyze_user(username: str, max_repos: int, cache_key: str) -> TechProfile:
+    # Queue this user's upstream requests fairly against other users'
+    with use_flow(username.lower()), use_deadline(REQUEST_DEADLINE):
+        # Ask for extra candidates, since selection drops some and re-ranks by recency
+        try:
+            repos = await github.get_top_user_repos(username, limit=max_repos * 2)
+        except GitHubUnavailable:
+            # Any earlier profile beats an error while GitHub is unavailable
+            stale = user_cache.get_stale(cache_key)
+            if stale is None:
+                raise
+            return _serve_stale(cache_key, stale)
+
+        # Skip forks and empty repos, rank the rest and pick a depth for each
+        selected = select_repos(repos, max_repos)
+        metrics.incr("repos_listed", len(repos))
+        for _, depth in selected:
+            metrics.incr(f"repos_analyzed_{depth}")
+
+        # Analyze all repos in parallel; cancelling us cancels them all
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(_settle(analyze_repo(
+                        username, repo["name"], github, depth, repo.get("languages")
+                    )))
+                    for repo, depth in selected
+                ]
+        except asyncio.CancelledError:
+            metrics.incr("repo_analyses_cancelled", sum(task.cancelled() for task in tasks))
+            raise
+        results = [task.result() for task in tasks]
+
+    repo_tech_ids = [result for result in results if isinstance(result, array)]
+    completeness = Completeness(
+        attempted=len(selected),
+        succeeded=len(repo_tech_ids),
+        failed=len(selected) - len(repo_tech_ids),
+        skipped=len(repos) - len(selected),
+    )
 
-    repos = await github.get_user_repos(username)
+    # Aggregate once and cache the profile
+    profile = TechProfile.from_ids(repo_tech_ids, completeness)
+    if completeness.complete:
+        user_cache.set(cache_key, profile)
+        return profile
 
-    # Filter out forks and sort by stars (most popular first)
-    repos = [r for r in repos if not r.get("fork")]
-    repos.sort(key=lambda r: r.get("stargazers_count", 0), reverse=True)
-    repos = repos[:max_repos]
+    metrics.incr("profiles_incomplete")
+    # An expired but complete profile is closer to the truth than a partial one
+    stale = user_cache.get_stale(cache_key)
+    if stale is not None and stale.completeness.complete:
+        return _serve_stale(cache_key, stale)
+    user_cache.set(cache_key, profile, ttl=INCOMPLETE_PROFILE_TTL)
+    return profile
 
-    # Analyze all repos in parallel
-    tasks = [analyze_repo(username, repo["name"], github) for repo in repos]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
 
-    all_technologies = []
-    for result in results:
-        if isinstance(result, list):
-            all_technologies.extend(result)
+def _serve_stale(cache_key: str, stale: TechProfile) -> TechProfile:
+    """Serve an expired profile, caching it again briefly.
+
+    Requests during an outage then hit the cache instead of repeating
+    the whole analysis against a failing API.
+    """
+    metrics.incr("profiles_stale_served")
+    user_cache.set(cache_key, stale, ttl=INCOMPLETE_PROFILE_TTL)
+    return stale
 
-    # Cache the result
-    user_cache.set(cache_key, all_technologies)
 
-    return all_technologies
+async def until_disconnected(request: Request, awaitable: Awaitable[T]) -> Optional[T]:
+    """Await something, cancelling it if the client disconnects first.
+
+    Returns None if the client went away.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                metrics.incr("requests_disconnected")
+                return None
+    finally:
+        task.cancel()
+
+
+def profile_max_age(profile: TechProfile, icons_complete: bool = True) -> int:
+    """Seconds browsers and proxies may cache a card of the profile.
+
+    Cards missing repos or icons (see fetch_icons) are cached briefly so
+    they are filled in once GitHub or the icon CDN recovers.
+    """
+    if profile.completeness.complete and icons_complete:
+        return 3600
+    return INCOMPLETE_PROFILE_TTL
 
 
 @app.get("/")
@@ -143,6 +317,7 @@ DEMO_TECHNOLOGIES = [
     Technology("Redis", "database", "redis", "#DC382D", 2),
     Technology("Vue.js", "framework", "vue", "#4FC08D", 2),
 ]
+DEMO_PROFILE = TechProfile.from_technologies(DEMO_TECHNOLOGIES)
 
 
 @app.get("/demo/techstack.svg")
@@ -154,10 +329,10 @@ async def get_demo_techstack(
     max_items: Optional[int] = Query(None, ge=1, le=50, description="Max technologies to display (1-50)"),
 ):
     """Demo endpoint with mock data for testing."""
-    await fetch_icons([t.icon for t in DEMO_TECHNOLOGIES])
+    await fetch_icons([t.icon for t in DEMO_PROFILE.technologies])
 
     svg = svg_generator.generate(
-        technologies=DEMO_TECHNOLOGIES,
+        technologies=DEMO_PROFILE,
         username="demo-user",
         theme_name=theme,
         style_name=style,
@@ -177,6 +352,7 @@ async def get_demo_techstack(
 
 @app.get("/{username}/techstack.svg")
 async def get_user_techstack(
+    request: Request,
     username: str,
     theme: Optional[str] = Query("light", regex="^(light|dark|dracula|nord|monokai|github-dimmed|solarized-light|solarized-dark|gruvbox-light|gruvbox-dark|one-dark|tokyo-night|catppuccin|synthwave|rose-pine|ayu-dark|cobalt|oceanic|night-owl)$"),
     style: Optional[str] = Query("card", regex="^(card|badges|grid|pie)$"),
@@ -185,11 +361,13 @@ async def get_user_techstack(
     max_items: Optional[int] = Query(None, ge=1, le=50, description="Max technologies to display (1-50)"),
 ):
     """Generate SVG for user's complete tech stack."""
-    technologies = await analyze_user(username)
-    await fetch_icons([t.icon for t in technologies])
+    profile = await until_disconnected(request, analyze_user(username))
+    if profile is None:
+        return Response(status_code=499)  # Nobody to answer
+    icons_complete = await fetch_icons([t.icon for t in profile.technologies])
 
     svg = svg_generator.generate(
-        technologies=technologies,
+        technologies=profile,
         username=username,
         theme_name=theme,
         style_name=style,
@@ -202,7 +380,7 @@ async def get_user_techstack(
         content=svg,
         media_type="image/svg+xml",
         headers={
-            "Cache-Control": "public, max-age=3600",
+            "Cache-Control": f"public, max-age={profile_max_age(profile, icons_complete)}",
             "Content-Disposition": f"inline; filename={username}-techstack.svg",
         },
     )
@@ -210,6 +388,7 @@ async def get_user_techstack(
 
 @app.get("/{username}/frameworks.svg")
 async def get_user_frameworks(
+    request: Request,
     username: str,
     theme: Optional[str] = Query("light", regex="^(light|dark|dracula|nord|monokai|github-dimmed|solarized-light|solarized-dark|gruvbox-light|gruvbox-dark|one-dark|tokyo-night|catppuccin|synthwave|rose-pine|ayu-dark|cobalt|oceanic|night-owl)$"),
     style: Optional[str] = Query("card", regex="^(card|badges|grid|pie)$"),
@@ -218,11 +397,13 @@ async def get_user_frameworks(
     max_items: Optional[int] = Query(None, ge=1, le=50, description="Max technologies to display (1-50)"),
 ):
     """Generate SVG for user's frameworks only."""
-    technologies = await analyze_user(username)
+    profile = await until_disconnected(request, analyze_user(username))
+    if profile is None:
+        return Response(status_code=499)  # Nobody to answer
 
     # Filter to frameworks only
-    frameworks = [t for t in technologies if t.category == "framework"]
-    await fetch_icons([t.icon for t in frameworks])
+    frameworks = profile.only("framework")
+    icons_complete = await fetch_icons([t.icon for t in frameworks.technologies])
 
     svg = svg_generator.generate(
         technologies=frameworks,
@@ -238,13 +419,14 @@ async def get_user_frameworks(
         content=svg,
         media_type="image/svg+xml",
         headers={
-            "Cache-Control": "public, max-age=3600",
+            "Cache-Control": f"public, max-age={profile_max_age(profile, icons_complete)}",
         },
     )
 
 
 @app.get("/repo/{owner}/{repo}/tech.svg")
 async def get_repo_tech(
+    request: Request,
     owner: str,
     repo: str,
     theme: Optional[str] = Query("light", regex="^(light|dark|dracula|nord|monokai|github-dimmed|solarized-light|solarized-dark|gruvbox-light|gruvbox-dark|one-dark|tokyo-night|catppuccin|synthwave|rose-pine|ayu-dark|cobalt|oceanic|night-owl)$"),
@@ -254,11 +436,15 @@ async def get_repo_tech(
     max_items: Optional[int] = Query(None, ge=1, le=50, description="Max technologies to display (1-50)"),
 ):
     """Generate SVG for a single repository's tech stack."""
-    technologies = await analyze_repo(owner, repo, github)
-    await fetch_icons([t.icon for t in technologies])
+    with use_flow(owner.lower()), use_deadline(REQUEST_DEADLINE):
+        tech_ids = await until_disconnected(request, analyze_repo(owner, repo, github))
+    if tech_ids is None:
+        return Response(status_code=499)  # Nobody to answer
+    profile = TechProfile.from_ids([tech_ids])
+    icons_complete = await fetch_icons([t.icon for t in profile.technologies])
 
     svg = svg_generator.generate(
-        technologies=technologies,
+        technologies=profile,
         username=f"{owner}/{repo}",
         theme_name=theme,
         style_name=style,
@@ -271,7 +457,7 @@ async def get_repo_tech(
         content=svg,
         media_type="image/svg+xml",
         headers={
-            "Cache-Control": "public, max-age=3600",
+            "Cache-Control": f"public, max-age={profile_max_age(profile, icons_complete)}",
         },
     )
 
@@ -288,4 +474,12 @@ async def cache_stats():
     return {
         "api_cache": cache.stats(),
         "user_cache": user_cache.stats(),
+        "svg_cache": svg_cache.stats(),
+        "manifest_cache": manifest_cache.stats(),
     }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Analysis and client metrics endpoint."""
+    return metrics.snapshot()
@@ -0,0 +1,69 @@
+from collections import defaultdict, deque
+from typing import Optional
+
+# Number of recent observations kept per summary
+SUMMARY_WINDOW = 1000
+
+
+class Metrics:
+    """Process-wide counters, gauges and summaries, exposed on /metrics."""
+
+    def __init__(self):
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._summaries: dict[str, deque[float]] = {}
+        self._observed: defaultdict[str, int] = defaultdict(int)
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a sample (e.g. a latency) for percentile summaries."""
+        samples = self._summaries.get(name)
+        if samples is None:
+            samples = self._summaries[name] = deque(maxlen=SUMMARY_WINDOW)
+        samples.append(value)
+        self._observed[name] += 1
+
+    def percentile(self, name: str, q: float) -> Optional[float]:
+        """Return the q-th percentile (0-100) of recent samples, if any."""
+        samples = self._summaries.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+    def get(self, name: str) -> float:
+        """Return a counter or gauge value (0 if never recorded)."""
+        if name in self._gauges:
+            return self._gauges[name]
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """Return all metrics, sorted by name."""
+        return {
+            "counters": dict(sorted(self._counters.items())),
+            "gauges": dict(sorted(self._gauges.items())),
+            "summaries": {
+                name: {
+                    "count": self._observed[name],
+                    "p50": self.percentile(name, 50),
+                    "p95": self.percentile(name, 95),
+                    "p99": self.percentile(name, 99),
+                }
+                for name in sorted(self._summaries)
+            },
+        }
+
+    def clear(self) -> None:
+        self._counters.clear()
+        self._gauges.clear()
+        self._summaries.clear()
+        self._observed.clear()
+
+
+# Global metrics instance
+metrics = Metrics()
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+from .cache import TTLCache
+from .limiter import BACKGROUND, use_priority
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Re-analyze hot profiles in the background before their cache entry expires
+REFRESH_ENABLED = os.getenv("BACKGROUND_REFRESH", "").lower() in ("1", "true", "yes")
+# Access counts halve every hour
+ACCESS_HALF_LIFE = 3600.0
+# Decayed access count from which a profile is hot (about 3 requests an hour)
+HOT_SCORE = 3.0
+# Refresh hot entries expiring within this many seconds
+REFRESH_AHEAD = 300.0
+# Seconds between passes over the tracked profiles
+REFRESH_INTERVAL = 30.0
+# Only refresh while this share of the GitHub rate limit is left
+MIN_RATE_LIMIT_HEADROOM = 0.25
+# Profiles tracked at most; the coldest is forgotten first
+MAX_TRACKED = 1000
+
+
+@dataclass(slots=True)
+class AccessStats:
+    score: float  # Access count, decayed with ACCESS_HALF_LIFE
+    updated_at: float
+    refresh: Callable[[], Awaitable]  # Re-analyzes and re-caches the profile
+    refreshed_at: float = -math.inf
+
+    def decayed(self, now: float) -> float:
+        return self.score * 0.5 ** ((now - self.updated_at) / ACCESS_HALF_LIFE)
+
+
+class Refresher:
+    """Keep frequently requested profiles in the cache.
+
+    record() counts accesses per cache key. Every REFRESH_INTERVAL the
+    hot keys (decayed count at least HOT_SCORE) whose entries expire
+    within REFRESH_AHEAD are re-analyzed, hottest first, one at a time
+    and at background priority, so live requests for them keep hitting
+    the cache. Keys evicted from the cache are left to the next live
+    request: far more keys are tracked than the cache holds, and
+    refreshing them would only evict each other. Passes are skipped
+    while the rate limit headroom reported by `headroom` is below
+    MIN_RATE_LIMIT_HEADROOM.
+    """
+
+    def __init__(self, cache: TTLCache, headroom: Callable[[], Optional[float]]):
+        self._cache = cache
+        self._headroom = headroom
+        self._stats: dict[str, AccessStats] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, key: str, refresh: Callable[[], Awaitable]) -> None:
+        """Count an access to a cached profile and how to refresh it."""
+        now = time.monotonic()
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= MAX_TRACKED:
+                coldest = min(self._stats, key=lambda k: self._stats[k].decayed(now))
+                del self._stats[coldest]
+            stats = self._stats[key] = AccessStats(0.0, now, refresh)
+        stats.score = stats.decayed(now) + 1
+        stats.updated_at = now
+        stats.refresh = refresh
+
+    def due(self) -> list[str]:
+        """Hot keys whose cached entries are about to expire, hottest first."""
+        now = time.monotonic()
+        hot = []
+        for key, stats in self._stats.items():
+            score = stats.decayed(now)
+            if score < HOT_SCORE or now - stats.refreshed_at < REFRESH_AHEAD:
+                continue
+            expires_in = self._cache.expires_in(key)
+            if expires_in is not None and expires_in < REFRESH_AHEAD:
+                hot.append((score, key))
+        metrics.set_gauge("hot_profiles", sum(
+            stats.decayed(now) >= HOT_SCORE for stats in self._stats.values()
+        ))
+        return [key for _, key in sorted(hot, reverse=True)]
+
+    async def refresh_due(self) -> None:
+        """Run one pass: refresh every due key while the budget lasts."""
+        for key in self.due():
+            headroom = self._headroom()
+            if headroom is not None and headroom < MIN_RATE_LIMIT_HEADROOM:
+                metrics.incr("refreshes_skipped_budget")
+                return
+            stats = self._stats.get(key)
+            if stats is None:
+                continue
+            stats.refreshed_at = time.monotonic()
+            try:
+                with use_priority(BACKGROUND):
+                    await stats.refresh()
+                metrics.incr("refreshes")
+            except Exception as e:
+                metrics.incr("refreshes_failed")
+                logger.warning(f"Refreshing {key} failed: {e}")
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(REFRESH_INTERVAL)
+            await self.refresh_due()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
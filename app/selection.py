@@ -0,0 +1,92 @@
+import math
+import os
+from datetime import datetime, timezone
+from typing import Optional
+from .analyzers import ALL_ANALYZERS, BaseAnalyzer, LanguageAnalyzer
+
+# Analysis depths
+FULL = "full"  # languages and every manifest analyzer
+LANGUAGES_ONLY = "languages"  # languages breakdown only (one request)
+
+ANALYZERS_BY_DEPTH: dict[str, list[BaseAnalyzer]] = {
+    FULL: ALL_ANALYZERS,
+    LANGUAGES_ONLY: [a for a in ALL_ANALYZERS if isinstance(a, LanguageAnalyzer)],
+}
+
+# Cap on repos analyzed in full, highest-scoring first (unset: all selected repos)
+MAX_FULL_REPOS = int(os.getenv("MAX_FULL_REPOS", "0")) or None
+# Repos not pushed to for this long are analyzed for languages only
+STALE_REPO_DAYS = int(os.getenv("STALE_REPO_DAYS", "730"))
+# Half-life of the recency bonus in days
+RECENCY_HALF_LIFE_DAYS = 365
+
+
+def _pushed_days_ago(repo: dict, now: datetime) -> Optional[float]:
+    pushed_at = repo.get("pushed_at")
+    if not pushed_at:
+        return None
+    try:
+        pushed = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return max((now - pushed).total_seconds() / 86400, 0.0)
+
+
+def is_relevant(repo: dict) -> bool:
+    """Check if a repo can contribute anything to the tech stack."""
+    return not repo.get("fork") and repo.get("size") != 0
+
+
+def score_repo(repo: dict, now: Optional[datetime] = None) -> float:
+    """Score a repo by popularity, recent activity and size.
+
+    Stars and size count logarithmically, so one viral repo does not
+    crowd out everything else; recency adds up to 2 points.
+    """
+    now = now or datetime.now(timezone.utc)
+    score = math.log1p(repo.get("stargazers_count", 0))
+    score += 0.25 * math.log1p(repo.get("size") or 0)
+
+    days = _pushed_days_ago(repo, now)
+    if days is not None:
+        score += 2 * 0.5 ** (days / RECENCY_HALF_LIFE_DAYS)
+    return score
+
+
+def select_repos(
+    repos: list[dict],
+    max_repos: int,
+    max_full: Optional[int] = MAX_FULL_REPOS,
+    now: Optional[datetime] = None,
+) -> list[tuple[dict, str]]:
+    """Choose which repos to analyze and how deep.
+
+    Forks and empty repos are skipped. The rest are ranked by score and
+    the top max_repos kept. Up to max_full of those (all if None) get a
+    full analysis; the others, along with archived, template and stale
+    repos, only contribute their languages.
+
+    Returns:
+        (repo, depth) pairs, best first
+    """
+    now = now or datetime.now(timezone.utc)
+    candidates = [repo for repo in repos if is_relevant(repo)]
+    candidates.sort(key=lambda repo: score_repo(repo, now), reverse=True)
+
+    if max_full is None:
+        max_full = max_repos
+    selected = []
+    full = 0
+    for repo in candidates[:max_repos]:
+        days = _pushed_days_ago(repo, now)
+        shallow = (
+            repo.get("archived")
+            or repo.get("is_template")
+            or (days is not None and days > STALE_REPO_DAYS)
+        )
+        if not shallow and full < max_full:
+            selected.append((repo, FULL))
+            full += 1
+        else:
+            selected.append((repo, LANGUAGES_ONLY))
+    return selected
@@ -1,5 +1,6 @@
 from .generator import SVGGenerator
 from .themes import THEMES, get_theme
 from .styles import STYLES
+from .layout import Layout, get_layout
 
-__all__ = ["SVGGenerator", "THEMES", "get_theme", "STYLES"]
+__all__ = ["SVGGenerator", "THEMES", "get_theme", "STYLES", "Layout", "get_layout"]
@@ -1,10 +1,15 @@
 import math
+import os
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 from ..analyzers.base import Technology
-from .themes import Theme, get_theme
+from ..analyzers.profile import TechProfile
+from ..cache import svg_cache
+from .themes import Theme, PLACEHOLDER_THEME, get_theme, make_skeleton, apply_theme
 from .styles import Style, STYLES
+from .layout import get_layout
 from .icons import get_icon_url, get_icon_data_uri
+from .native import NATIVE_RENDERERS
 
 
 CATEGORY_LABELS = {
@@ -71,7 +76,10 @@ CATEGORY_COLORS = {
 class SVGGenerator:
     """Generate SVG images from technology data."""
 
-    def __init__(self, templates_dir: str = None):
+    def __init__(self, templates_dir: str = None, renderer: str = None):
+        # "native" uses the string-builder renderers in native.py, "jinja"
+        # renders the templates directly. Both produce identical output.
+        self.renderer = renderer or os.getenv("SVG_RENDERER", "native")
         if templates_dir is None:
             templates_dir = Path(__file__).parent.parent.parent / "templates"
         self.env = Environment(
@@ -84,7 +92,7 @@ class SVGGenerator:
 
     def generate(
         self,
-        technologies: list[Technology],
+        technologies: list[Technology] | TechProfile,
         username: str,
         theme_name: str = "light",
         style_name: str = "card",
@@ -96,7 +104,7 @@ class SVGGenerator:
         """Generate SVG for given technologies.
 
         Args:
-            technologies: List of detected technologies
+            technologies: Aggregated profile or list of detected technologies
             username: GitHub username
             theme_name: Theme name
             style_name: Style name (card, badges, grid, pie)
@@ -107,33 +115,49 @@ class SVGGenerator:
         theme = get_theme(theme_name)
         style = STYLES.get(style_name, STYLES["card"])
 
-        # Aggregate technologies by name
-        tech_map: dict[str, Technology] = {}
-        for tech in technologies:
-            if tech.name in tech_map:
-                tech_map[tech.name].count += tech.count
-            else:
-                tech_map[tech.name] = Technology(
-                    name=tech.name,
-                    category=tech.category,
-                    icon=tech.icon,
-                    color=tech.color,
-                    count=tech.count,
-                )
-
-        # Sort by count (descending)
-        sorted_techs = sorted(tech_map.values(), key=lambda t: t.count, reverse=True)
+        if not isinstance(technologies, TechProfile):
+            technologies = TechProfile.from_technologies(technologies)
 
         # Apply max_items filter
         if max_items is not None:
             max_items = max(1, min(max_items, 50))
-            sorted_techs = sorted_techs[:max_items]
+        sorted_techs = technologies.top(max_items)
 
-        # Calculate dimensions
-        num_items = len(sorted_techs)
-        if num_items == 0:
+        if not sorted_techs:
             return self._generate_empty(username, theme, style)
 
+        # Render the theme-independent skeleton once per profile/layout and
+        # apply the requested theme by substitution.
+        key = (
+            username,
+            style.name,
+            columns,
+            forced_height,
+            hide_border,
+            max_items,
+            technologies.fingerprint,
+            tuple(bool(get_icon_data_uri(t.icon)) for t in sorted_techs),
+        )
+        skeleton = svg_cache.get(key)
+        if skeleton is None:
+            skeleton = make_skeleton(
+                self._render(sorted_techs, username, style, columns, hide_border, forced_height)
+            )
+            svg_cache.set(key, skeleton)
+        return apply_theme(skeleton, theme)
+
+    def _render(
+        self,
+        sorted_techs: tuple[Technology, ...],
+        username: str,
+        style: Style,
+        columns: int,
+        hide_border: bool,
+        forced_height: int,
+    ) -> str:
+        """Render sorted technologies with the placeholder theme."""
+        num_items = len(sorted_techs)
+
         # Calculate max_count and category summary
         max_count = max((t.count for t in sorted_techs), default=1)
 
@@ -150,68 +174,18 @@ class SVGGenerator:
                 "count": cnt,
             })
 
-        # Calculate adaptive columns
-        if columns is not None:
-            actual_columns = max(1, min(columns, 10))  # Limit 1-10
-        else:
-            actual_columns = self._calculate_columns(num_items, style)
+        layout = get_layout(style.name, num_items, columns, forced_height)
 
-        if style.name == "pie":
-            # Vertical list with individual progress bars
-            grid_style = STYLES["grid"]
-            # title(35) + gap(20) + items(40px each) + bottom padding
-            height = 35 + 20 + num_items * 40 + 16
-            rows = 1
-            width = (
-                grid_style.padding * 2
-                + grid_style.columns * grid_style.item_width
-                + (grid_style.columns - 1) * grid_style.gap
-            )
-        else:
-            rows = math.ceil(num_items / actual_columns)
-            width = (
-                style.padding * 2
-                + actual_columns * style.item_width
-                + (actual_columns - 1) * style.gap
-            )
-            if style.name == "card":
-                header_space = 70
-            elif style.name == "grid":
-                header_space = 0
-            else:
-                header_space = 40
-            height = (
-                style.padding * 2
-                + rows * style.item_height
-                + (rows - 1) * style.gap
-                + header_space
-            )
-
-        if forced_height is not None:
-            height = forced_height
-
-        # Create modified style with actual columns
-        actual_style = Style(
-            name=style.name,
-            template=style.template,
-            columns=actual_columns,
-            item_width=style.item_width,
-            item_height=style.item_height,
-            padding=style.padding,
-            gap=style.gap,
-        )
-
-        # Load and render template
-        template = self.env.get_template(style.template)
         total_count = sum(t.count for t in sorted_techs)
-        return template.render(
+        context = dict(
             technologies=sorted_techs,
             username=username,
-            theme=theme,
-            style=actual_style,
-            width=width,
-            height=height,
-            rows=rows,
+            theme=PLACEHOLDER_THEME,
+            style=layout.style,
+            layout=layout,
+            width=layout.width,
+            height=layout.height,
+            rows=layout.rows,
             max_count=max_count,
             total_count=total_count,
             category_labels=CATEGORY_LABELS,
@@ -220,25 +194,13 @@ class SVGGenerator:
             hide_border=hide_border,
         )
 
-    def _calculate_columns(self, num_items: int, style: Style) -> int:
-        """Calculate optimal number of columns based on item count."""
-        default = style.columns
-
-        # For pie chart, always 1 column
-        if style.name == "pie":
-            return 1
+        native = NATIVE_RENDERERS.get(style.name)
+        if self.renderer == "native" and native is not None:
+            return native(**context)
 
-        # Adaptive logic
-        if num_items <= 2:
-            return min(num_items, default)
-        elif num_items <= 4:
-            return min(4, default)
-        elif num_items <= 6:
-            return min(3, default) if style.name == "card" else min(6, default)
-        elif num_items <= 9:
-            return min(3, default) if style.name == "card" else default
-        else:
-            return default
+        # Load and render template
+        template = self.env.get_template(style.template)
+        return template.render(**context)
 
     def _generate_empty(
         self, username: str, theme: Theme, style: Style
@@ -1,3 +1,6 @@
+from typing import Optional
+from ..hedging import Hedger
+
 # Mapping from tech icon name to devicon name
 # Format: "our_icon": "devicon_name" or "our_icon": ("devicon_name", "variant")
 # Default variant is "original", alternatives: "plain", "line"
@@ -154,6 +157,9 @@ DEVICON_CDN = "https://cdn.jsdelivr.net/gh/devicons/devicon/icons"
 # In-memory cache for fetched icon data URIs
 _icon_cache: dict[str, str] = {}
 
+# Tracks CDN latency across calls to hedge the slow fetches
+_icon_hedger = Hedger("icons")
+
 
 def get_icon_url(icon_name: str) -> str:
     """Get devicon CDN URL for a technology icon."""
@@ -171,47 +177,64 @@ def get_icon_data_uri(icon_name: str) -> str:
     return _icon_cache.get(icon_name.lower(), "")
 
 
-async def fetch_icons(icon_names: list[str]) -> dict[str, str]:
-    """Fetch icons from CDN and return as base64 data URIs.
+async def fetch_icons(icon_names: list[str]) -> bool:
+    """Fetch icons from CDN into the cache read by get_icon_data_uri().
+
+    Icons are kept as base64 data URIs in memory for subsequent requests.
+    Icons the CDN failed to serve (or that were skipped while its circuit
+    breaker is open) are left out and retried next time. Slow fetches are
+    hedged (see hedging.Hedger).
 
-    Results are cached in memory for subsequent requests.
+    Returns:
+        False if some icons were left out, so a card rendered now is
+        missing them and should only be cached briefly
     """
     import httpx
     import base64
     import asyncio
+    from ..breaker import breaker_for
 
     to_fetch = []
-    result = {}
-
     for name in icon_names:
         name_lower = name.lower()
-        if name_lower in _icon_cache:
-            result[name_lower] = _icon_cache[name_lower]
-        else:
+        if name_lower not in _icon_cache:
             url = get_icon_url(name_lower)
             if url:
                 to_fetch.append((name_lower, url))
 
     if not to_fetch:
-        return result
+        return True
+
+    breaker = breaker_for(DEVICON_CDN)
 
     async with httpx.AsyncClient(timeout=5.0) as client:
-        async def _fetch_one(name: str, url: str) -> tuple[str, str]:
+        async def _fetch_one(name: str, url: str) -> tuple[str, Optional[str]]:
+            # None: not fetched this time, "": the CDN has no such icon
+            if not breaker.allow():
+                return name, None
             try:
-                resp = await client.get(url)
-                if resp.status_code == 200:
-                    b64 = base64.b64encode(resp.content).decode("ascii")
-                    data_uri = f"data:image/svg+xml;base64,{b64}"
-                    return name, data_uri
+                resp = await _icon_hedger.run(lambda: client.get(url))
             except Exception:
-                pass
+                breaker.record_failure()
+                return name, None
+            if resp.status_code >= 500:
+                breaker.record_failure()
+                return name, None
+            breaker.record_success()
+            if resp.status_code == 200:
+                b64 = base64.b64encode(resp.content).decode("ascii")
+                data_uri = f"data:image/svg+xml;base64,{b64}"
+                return name, data_uri
             return name, ""
 
         tasks = [_fetch_one(n, u) for n, u in to_fetch]
         fetched = await asyncio.gather(*tasks)
 
+        complete = True
         for name, data_uri in fetched:
-            _icon_cache[name] = data_uri
-            result[name] = data_uri
+            if data_uri is None:
+                complete = False
+            else:
+                _icon_cache[name] = data_uri
 
-    return result
+    return complete
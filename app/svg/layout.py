@@ -0,0 +1,139 @@
+import math
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Optional
+from .styles import Style, STYLES
+
+# Vertical space reserved above the items for each style's header
+HEADER_SPACE = {
+    "card": 70,
+    "grid": 0,
+}
+DEFAULT_HEADER_SPACE = 40
+
+# Offset of the first item row from the top padding
+ITEMS_OFFSET = {
+    "card": 64,
+    "badges": 38,
+    "grid": 0,
+}
+
+# Pie style: first row baseline and bottom margin
+PIE_CONTENT_START = 70
+PIE_CONTENT_END_MARGIN = 30
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Geometry of a rendered SVG, independent of technologies and theme.
+
+    get_layout() shares one instance between renders, so it is frozen,
+    like its Style.
+    """
+
+    style: Style
+    width: int
+    height: int
+    rows: int
+    positions: tuple[tuple[float, float], ...]  # (x, y) of each item
+
+
+def calculate_columns(num_items: int, style: Style) -> int:
+    """Calculate optimal number of columns based on item count."""
+    default = style.columns
+
+    # For pie chart, always 1 column
+    if style.name == "pie":
+        return 1
+
+    # Adaptive logic
+    if num_items <= 2:
+        return min(num_items, default)
+    elif num_items <= 4:
+        return min(4, default)
+    elif num_items <= 6:
+        return min(3, default) if style.name == "card" else min(6, default)
+    elif num_items <= 9:
+        return min(3, default) if style.name == "card" else default
+    else:
+        return default
+
+
+@lru_cache(maxsize=512)
+def get_layout(
+    style_name: str,
+    num_items: int,
+    columns: Optional[int] = None,
+    forced_height: Optional[int] = None,
+) -> Layout:
+    """Compute (and cache) the layout for a style and item count.
+
+    Args:
+        style_name: Style name (card, badges, grid, pie)
+        num_items: Number of items to place (must be at least 1)
+        columns: Number of columns (None = auto)
+        forced_height: Override the computed height
+    """
+    style = STYLES.get(style_name, STYLES["card"])
+
+    if columns is not None:
+        actual_columns = max(1, min(columns, 10))  # Limit 1-10
+    else:
+        actual_columns = calculate_columns(num_items, style)
+
+    if style.name == "pie":
+        # Vertical list with individual progress bars
+        grid_style = STYLES["grid"]
+        # title(35) + gap(20) + items(40px each) + bottom padding
+        height = 35 + 20 + num_items * 40 + 16
+        rows = 1
+        width = (
+            grid_style.padding * 2
+            + grid_style.columns * grid_style.item_width
+            + (grid_style.columns - 1) * grid_style.gap
+        )
+    else:
+        rows = math.ceil(num_items / actual_columns)
+        width = (
+            style.padding * 2
+            + actual_columns * style.item_width
+            + (actual_columns - 1) * style.gap
+        )
+        height = (
+            style.padding * 2
+            + rows * style.item_height
+            + (rows - 1) * style.gap
+            + HEADER_SPACE.get(style.name, DEFAULT_HEADER_SPACE)
+        )
+
+    if forced_height is not None:
+        height = forced_height
+
+    if style.name == "pie":
+        content_end = height - PIE_CONTENT_END_MARGIN
+        spacing = (
+            (content_end - PIE_CONTENT_START) / (num_items - 1)
+            if num_items > 1 else 0
+        )
+        positions = tuple(
+            (30, PIE_CONTENT_START + i * spacing) for i in range(num_items)
+        )
+    else:
+        step_x = style.item_width + style.gap
+        step_y = style.item_height + style.gap
+        top = style.padding + ITEMS_OFFSET.get(style.name, 0)
+        positions = tuple(
+            (
+                style.padding + (i % actual_columns) * step_x,
+                top + (i // actual_columns) * step_y,
+            )
+            for i in range(num_items)
+        )
+
+    return Layout(
+        style=replace(style, columns=actual_columns),
+        width=width,
+        height=height,
+        rows=rows,
+        positions=positions,
+    )
@@ -0,0 +1,355 @@
+# Pure-Python renderers that produce byte-identical output to the Jinja
+# templates in templates/. Each function mirrors its template line by line,
+# including the blank lines left behind by {% set %}/{% if %} tags, so keep
+# both in sync when editing either one (tests/test_native_render.py checks;
+# benchmarks/bench_render.py times both).
+
+from .icons import get_icon_data_uri
+
+
+def _border(theme, hide_border: bool) -> str:
+    if hide_border:
+        return ""
+    return f' stroke="{theme.border}" stroke-width="1"'
+
+
+def render_card(
+    technologies,
+    username,
+    theme,
+    style,
+    width,
+    height,
+    max_count,
+    category_labels,
+    category_summary,
+    hide_border,
+    layout,
+    **_,
+) -> str:
+    """Render the card style (see card.svg.jinja2)."""
+    pad = style.padding
+    item_w = style.item_width
+    card_h = style.item_height - 10
+    half_w = item_w // 2
+    max_chips = 5
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        "  <defs>\n"
+        "    <style>\n"
+        f"      .title {{ font: 700 16px system-ui, -apple-system, sans-serif; fill: {theme.accent}; }}\n"
+        f"      .subtitle {{ font: 400 11px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        f"      .chip-text {{ font: 500 11px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        f"      .tech-name {{ font: 600 12px system-ui, -apple-system, sans-serif; fill: {theme.text_primary}; }}\n"
+        f"      .tech-category {{ font: 400 10px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        f"      .tech-count {{ font: 500 10px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        "    </style>\n"
+        '    <clipPath id="card-clip">\n'
+        f'      <rect width="{item_w}" height="{card_h}" rx="8"/>\n'
+        "    </clipPath>\n"
+        "  </defs>\n"
+        "\n"
+        f'  <rect width="100%" height="100%" fill="{theme.background}" rx="8"{_border(theme, hide_border)}/>\n'
+        "\n"
+        "  <!-- Header -->\n"
+        f'  <text x="{pad}" y="{pad + 18}" class="title">@{username}\'s Tech Stack</text>\n'
+        "\n"
+        "  <!-- Separator line -->\n"
+        f'  <line x1="{pad}" y1="{pad + 28}" x2="{width - pad}" y2="{pad + 28}" stroke="{theme.border}" stroke-width="1"/>\n'
+        "\n"
+        "  <!-- Category summary chips (max 5, then +N) -->\n"
+        "  \n"
+        "  \n"
+        "  "
+    ]
+
+    chip_x = 0
+    for cat in category_summary[:max_chips]:
+        out.append(
+            f'\n  <circle cx="{pad + chip_x + 5}" cy="{pad + 44}" r="4" fill="{cat["color"]}"/>\n'
+            f'  <text x="{pad + chip_x + 13}" y="{pad + 48}" class="chip-text">{cat["count"]} {cat["label"]}</text>\n'
+            "  \n"
+            "  \n"
+            "  "
+        )
+        text_width = int((len(str(cat["count"])) + 1 + len(cat["label"])) * 6.5)
+        chip_x = chip_x + 13 + text_width + 16
+    out.append("\n  ")
+    if len(category_summary) > max_chips:
+        out.append(
+            f'\n  <text x="{pad + chip_x + 5}" y="{pad + 48}" class="chip-text">+{len(category_summary) - max_chips}</text>\n'
+            "  "
+        )
+    out.append(
+        "\n"
+        "\n"
+        "  <!-- Technology cards -->\n"
+        "  \n"
+        "  "
+    )
+
+    bar_w = 110
+    bar_x = (item_w - bar_w) // 2
+    for tech, (x, y) in zip(technologies, layout.positions):
+        color = tech.color
+        icon_data = get_icon_data_uri(tech.icon)
+        if icon_data:
+            icon = f'\n    <image x="{half_w - 14}" y="24" width="28" height="28" href="{icon_data}"/>\n    '
+        else:
+            icon = (
+                f'\n    <circle cx="{half_w}" cy="38" r="18" fill="{color}"/>\n'
+                f'    <text x="{half_w}" y="43" text-anchor="middle" fill="white" font-size="14" font-weight="bold">{tech.name[0]}</text>\n'
+                "    "
+            )
+        name = tech.name[:16] + (".." if len(tech.name) > 16 else "")
+        fill_w = int(bar_w * tech.count / max_count)
+        if fill_w < 4:
+            fill_w = 4
+        out.append(
+            "\n  \n"
+            "\n"
+            f'  <g transform="translate({x}, {y})">\n'
+            "    <!-- Card background with clipped accent bar -->\n"
+            '    <g clip-path="url(#card-clip)">\n'
+            f'      <rect width="{item_w}" height="{card_h}" fill="{theme.card_background}"/>\n'
+            f'      <rect width="{item_w}" height="4" fill="{color}"/>\n'
+            "    </g>\n"
+            f'    <rect width="{item_w}" height="{card_h}" fill="none" rx="8" stroke="{theme.border}" stroke-width="1"/>\n'
+            "\n"
+            "    <!-- Icon -->\n"
+            "    \n"
+            f'    <circle cx="{half_w}" cy="38" r="22" fill="{color}15"/>\n'
+            f"    {icon}\n"
+            "\n"
+            "    <!-- Name -->\n"
+            f'    <text x="{half_w}" y="78" text-anchor="middle" class="tech-name">{name}</text>\n'
+            "\n"
+            "    <!-- Category label -->\n"
+            f'    <text x="{half_w}" y="93" text-anchor="middle" class="tech-category">{category_labels.get(tech.category, tech.category)}</text>\n'
+            "\n"
+            "    <!-- Usage bar -->\n"
+            "    \n"
+            "    \n"
+            "    \n"
+            "    \n"
+            f'    <rect x="{bar_x}" y="102" width="{bar_w}" height="5" fill="{theme.border}" rx="2.5" opacity="0.5"/>\n'
+            f'    <rect x="{bar_x}" y="102" width="{fill_w}" height="5" fill="{color}" rx="2.5"/>\n'
+            "\n"
+            "    <!-- Count -->\n"
+            f'    <text x="{half_w}" y="122" text-anchor="middle" class="tech-count">{tech.count} repo{"s" if tech.count != 1 else ""}</text>\n'
+            "  </g>\n"
+            "  "
+        )
+    out.append("\n</svg>")
+    return "".join(out)
+
+
+def render_badges(
+    technologies,
+    username,
+    theme,
+    style,
+    width,
+    height,
+    category_colors,
+    hide_border,
+    layout,
+    **_,
+) -> str:
+    """Render the badges style (see badges.svg.jinja2)."""
+    pad = style.padding
+    item_w = style.item_width
+    item_h = style.item_height
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        "  <defs>\n"
+        "    <style>\n"
+        f"      .title {{ font: 600 14px system-ui, -apple-system, sans-serif; fill: {theme.accent}; }}\n"
+        f"      .subtitle {{ font: 400 11px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        "      .badge-text { font: 500 10px system-ui, -apple-system, sans-serif; fill: white; }\n"
+        "      .badge-count { font: 600 8px system-ui, -apple-system, sans-serif; fill: white; }\n"
+        "    </style>\n"
+        "  </defs>\n"
+        "\n"
+        f'  <rect width="100%" height="100%" fill="{theme.background}" rx="8"{_border(theme, hide_border)}/>\n'
+        "\n"
+        "  <!-- Header -->\n"
+        f'  <text x="{pad}" y="{pad + 12}" class="title">@{username}</text>\n'
+        f'  <text x="{pad}" y="{pad + 26}" class="subtitle">{len(technologies)} technologies</text>\n'
+        "\n"
+        "  <!-- Badges -->\n"
+        "  "
+    ]
+
+    text_y = item_h // 2 + 4
+    for tech, (bx, by) in zip(technologies, layout.positions):
+        color = tech.color
+        label = tech.name[:14]
+        icon_data = get_icon_data_uri(tech.icon)
+        if icon_data:
+            content = (
+                f'\n    <image x="6" y="{(item_h - 16) // 2}" width="16" height="16" href="{icon_data}"/>\n'
+                f'    <text x="{26 + (item_w - 26) // 2}" y="{text_y}" text-anchor="middle" class="badge-text">{label}</text>\n'
+                "    "
+            )
+        else:
+            content = (
+                f'\n    <text x="{item_w // 2}" y="{text_y}" text-anchor="middle" class="badge-text">{label}</text>\n'
+                "    "
+            )
+        if tech.count > 1:
+            count = (
+                f'\n    <circle cx="{item_w - 8}" cy="8" r="7" fill="{theme.background}" opacity="0.85"/>\n'
+                f'    <text x="{item_w - 8}" y="11" text-anchor="middle" class="badge-count" fill="{color}">{tech.count}</text>\n'
+                "    "
+            )
+        else:
+            count = ""
+        out.append(
+            "\n  \n"
+            "\n"
+            f'  <g transform="translate({bx}, {by})">\n'
+            "    \n"
+            f'    <rect width="{item_w}" height="{item_h}" fill="{color}" rx="4"/>\n'
+            "    <!-- Category indicator strip -->\n"
+            f'    <rect width="3" height="{item_h}" fill="{category_colors.get(tech.category, "#8b949e")}" rx="1.5" opacity="0.6"/>\n'
+            f"    {content}\n"
+            "    <!-- Count circle -->\n"
+            f"    {count}\n"
+            "  </g>\n"
+            "  "
+        )
+    out.append("\n</svg>")
+    return "".join(out)
+
+
+def render_grid(
+    technologies,
+    theme,
+    style,
+    width,
+    height,
+    hide_border,
+    layout,
+    **_,
+) -> str:
+    """Render the grid style (see grid.svg.jinja2)."""
+    half_w = style.item_width // 2
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        "  <defs>\n"
+        "    <style>\n"
+        f"      .title {{ font: 600 14px system-ui, -apple-system, sans-serif; fill: {theme.accent}; }}\n"
+        f"      .subtitle {{ font: 400 11px system-ui, -apple-system, sans-serif; fill: {theme.text_secondary}; }}\n"
+        f"      .icon-label {{ font: 500 10px system-ui, -apple-system, sans-serif; fill: {theme.text_primary}; }}\n"
+        "      .icon-count { font: 600 9px system-ui, -apple-system, sans-serif; }\n"
+        "    </style>\n"
+        "  </defs>\n"
+        "\n"
+        f'  <rect width="100%" height="100%" fill="{theme.background}" rx="8"{_border(theme, hide_border)}/>\n'
+        "\n"
+        "\n"
+        "  <!-- Grid items -->\n"
+        "  "
+    ]
+
+    for tech, (x, y) in zip(technologies, layout.positions):
+        color = tech.color
+        icon_data = get_icon_data_uri(tech.icon)
+        if icon_data:
+            icon = f'\n    <image x="{half_w - 16}" y="2" width="32" height="32" href="{icon_data}"/>\n    '
+        else:
+            icon = (
+                f'\n    <circle cx="{half_w}" cy="18" r="18" fill="{color}"/>\n'
+                f'    <text x="{half_w}" y="23" text-anchor="middle" fill="white" font-size="14" font-weight="bold">{tech.name[0]}</text>\n'
+                "    "
+            )
+        name = tech.name[:14] + (".." if len(tech.name) > 14 else "")
+        out.append(
+            "\n  \n"
+            "\n"
+            f'  <g transform="translate({x}, {y})">\n'
+            "    \n"
+            "    <!-- Icon -->\n"
+            f"    {icon}\n"
+            "\n"
+            "    <!-- Label -->\n"
+            f'    <text x="{half_w}" y="50" text-anchor="middle" class="icon-label">{name}</text>\n'
+            "\n"
+            "    <!-- Count indicator -->\n"
+            f'    <text x="{half_w}" y="62" text-anchor="middle" class="icon-count" fill="{color}">{tech.count} repo{"s" if tech.count != 1 else ""}</text>\n'
+            "  </g>\n"
+            "  "
+        )
+    out.append("\n</svg>")
+    return "".join(out)
+
+
+def render_pie(
+    technologies,
+    theme,
+    width,
+    height,
+    hide_border,
+    layout,
+    **_,
+) -> str:
+    """Render the pie style (see pie.svg.jinja2)."""
+    total = sum(t.count for t in technologies)
+    bar_width = width - 60
+    max_pct = (technologies[0].count / total * 100) if total > 0 and technologies else 0
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">\n'
+        "  <defs>\n"
+        "    <style>\n"
+        f"      .title {{ font: 700 18px system-ui, -apple-system, sans-serif; fill: {theme.text_primary}; }}\n"
+        f"      .lang-name {{ font: 600 13px system-ui, -apple-system, sans-serif; fill: {theme.text_primary}; }}\n"
+        f"      .lang-pct {{ font: 400 13px system-ui, -apple-system, sans-serif; fill: {theme.text_primary}; }}\n"
+        "    </style>\n"
+        "  </defs>\n"
+        "\n"
+        f'  <rect width="100%" height="100%" fill="{theme.background}" rx="8"{_border(theme, hide_border)}/>\n'
+        "\n"
+        "  <!-- Title -->\n"
+        '  <text x="30" y="40" class="title">Most Used Technologies</text>\n'
+        "\n"
+        "  \n  \n  \n"
+        "\n"
+        "  "
+    ]
+
+    for tech, (_, item_y) in zip(technologies, layout.positions):
+        pct = (tech.count / total * 100) if total > 0 else 0
+        icon_data = get_icon_data_uri(tech.icon)
+        if icon_data:
+            icon = f'\n    <image x="0" y="-14" width="18" height="18" href="{icon_data}"/>\n    '
+        else:
+            icon = f'\n    <circle cx="9" cy="-5" r="8" fill="{tech.color}"/>\n    '
+        out.append(
+            "\n  \n  \n"
+            "\n"
+            f"  <!-- {tech.name} -->\n"
+            f'  <g transform="translate(30, {item_y})">\n'
+            "    \n"
+            f"    {icon}\n"
+            f'    <text x="26" y="0" class="lang-name">{tech.name}</text>\n'
+            f'    <text x="{bar_width}" y="0" text-anchor="end" class="lang-pct">{"%.2f" % pct}%</text>\n'
+            f'    <rect x="0" y="10" width="{bar_width}" height="10" rx="5" fill="{theme.border}" opacity="0.3"/>\n'
+            f'    <rect x="0" y="10" width="{(pct / max_pct * bar_width) if max_pct > 0 else 0}" height="10" rx="5" fill="{tech.color}"/>\n'
+            "  </g>\n"
+            "  "
+        )
+    out.append("\n</svg>")
+    return "".join(out)
+
+
+NATIVE_RENDERERS = {
+    "card": render_card,
+    "badges": render_badges,
+    "grid": render_grid,
+    "pie": render_pie,
+}
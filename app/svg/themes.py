@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import re
+from dataclasses import dataclass, fields
 
 
 @dataclass
@@ -190,3 +191,33 @@ THEMES = {
 def get_theme(name: str) -> Theme:
     """Get theme by name, defaults to light."""
     return THEMES.get(name, THEMES["light"])
+
+
+# Two-phase rendering: SVGs are rendered once with PLACEHOLDER_THEME and
+# split into a skeleton of literal text and theme field names. Applying a
+# theme is then a single pass that fills in the field values.
+THEME_COLOR_FIELDS = tuple(f.name for f in fields(Theme) if f.name != "name")
+
+PLACEHOLDER_THEME = Theme(
+    name="placeholder",
+    **{field: f"\x00{field}\x00" for field in THEME_COLOR_FIELDS},
+)
+
+_PLACEHOLDER_RE = re.compile("\x00(" + "|".join(THEME_COLOR_FIELDS) + ")\x00")
+
+
+def make_skeleton(svg: str) -> tuple[str, ...]:
+    """Split an SVG rendered with PLACEHOLDER_THEME into a theme skeleton.
+
+    Even indices hold literal text, odd indices hold Theme field names.
+    """
+    return tuple(_PLACEHOLDER_RE.split(svg))
+
+
+def apply_theme(skeleton: tuple[str, ...], theme: Theme) -> str:
+    """Fill a skeleton from make_skeleton() with the theme's colors."""
+    values = vars(theme)
+    parts = list(skeleton)
+    for i in range(1, len(parts), 2):
+        parts[i] = values[parts[i]]
+    return "".join(parts)
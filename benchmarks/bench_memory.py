@@ -0,0 +1,66 @@
+"""Compare the memory held by per-repo results: Technology lists vs id arrays.
+
+Simulates an organization's repos, each with a handful of detections,
+and measures with tracemalloc what keeping every repo's result costs.
+"Before" is the old representation, a Technology object per detection;
+"after" is the compact one, an array of 2-byte registry ids per repo.
+
+Usage: python benchmarks/bench_memory.py [repos] [detections per repo]
+"""
+
+import os
+import random
+import sys
+import tracemalloc
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analyzers import REGISTRY, TechProfile
+from app.analyzers.base import Technology
+
+
+def measure(build) -> tuple[object, int]:
+    """Build a value and return it with the bytes it keeps allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, after - before
+
+
+def main():
+    repos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    per_repo = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    rng = random.Random(0)
+    detections = [
+        [REGISTRY[rng.randrange(len(REGISTRY))] for _ in range(per_repo)]
+        for _ in range(repos)
+    ]
+
+    # Before: a fresh Technology per detection, copying the strings' references
+    lists, list_bytes = measure(lambda: [
+        [Technology(t.name, t.category, t.icon, t.color) for t in techs]
+        for techs in detections
+    ])
+    # After: the registry's interned TechInfo, referenced by id
+    arrays, array_bytes = measure(lambda: [
+        array("H", (t.id for t in techs)) for techs in detections
+    ])
+
+    assert TechProfile.from_technologies([t for techs in lists for t in techs]).fingerprint == (
+        TechProfile.from_ids(arrays).fingerprint
+    )
+    print(f"{repos} repos x {per_repo} detections ({len(REGISTRY)} known technologies)")
+    print("Memory kept for all repos' results (lower is better):")
+    for label, size in (
+        ("before: Technology lists", list_bytes),
+        ("after: id arrays", array_bytes),
+    ):
+        print(f"  {label:26} {size / 1e6:6.2f} MB  {size / repos:6.0f} B per repo")
+    print(f"The id arrays take {list_bytes / array_bytes:.0f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Time the native renderers against the Jinja templates.
+
+Usage: python benchmarks/bench_render.py [items] [repeats]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analyzers.base import Technology
+from app.svg.generator import SVGGenerator
+from app.svg.styles import STYLES
+
+CATEGORIES = ["language", "framework", "devops", "database", "ci"]
+
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    techs = tuple(
+        Technology(f"Tech{i}", CATEGORIES[i % len(CATEGORIES)], "react", "#123456", items - i)
+        for i in range(items)
+    )
+    generators = {name: SVGGenerator(renderer=name) for name in ("jinja", "native")}
+
+    print(f"{items} items, best of 5 x {repeats} renders (skeleton only, no cache)")
+    for style in sorted(STYLES):
+        timings = {}
+        for name, generator in generators.items():
+            def render():
+                generator._render(techs, "user", STYLES[style], None, False, None)
+            timings[name] = min(timeit.repeat(render, number=repeats, repeat=5)) / repeats
+        print(
+            f"{style:8} jinja {timings['jinja'] * 1e6:7.0f}us  "
+            f"native {timings['native'] * 1e6:7.0f}us  "
+            f"({timings['jinja'] / timings['native']:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare scan_text() with the per-name substring scans it replaced.
+
+scan_text() is the fallback for manifests that cannot be parsed. The
+synthetic setup.py and (malformed) Cargo.toml are padded with names that
+contain known dependencies, which the old scans reported by mistake.
+scan_text() is not faster; the timings show what the whole-word matching
+costs.
+
+Usage: python benchmarks/bench_rules.py [lines] [repeats]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.analyzers.rules import DEPENDENCY_INDEX, match_dependencies, scan_text
+
+
+def substring_scan(ecosystem: str, text: str):
+    """The old matcher: one substring search per known name."""
+    text = text.lower()
+    return match_dependencies(
+        ecosystem, [dep for dep in DEPENDENCY_INDEX.get(ecosystem, {}) if dep in text]
+    )
+
+
+def setup_py(lines: int) -> str:
+    body = "\n".join(f'    "package-{i}>=1.{i}",  # promotor torchvision' for i in range(lines))
+    return f'from setuptools import setup\nsetup(\n  install_requires=[\n    "django",\n{body}\n  ],\n)\n'
+
+
+def cargo_toml(lines: int) -> str:
+    body = "\n".join(f'crate-{i} = "0.{i}"  # warpgate' for i in range(lines))
+    return f'[package\nname = "app"\n[dependencies]\ntokio = "1"\n{body}\n'
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    samples = [("setup.py", "pypi", setup_py(lines)), ("Cargo.toml", "cargo", cargo_toml(lines))]
+
+    print(f"{lines} lines, best of 5 x {repeats} scans")
+    for name, ecosystem, text in samples:
+        print(f"{name}, {len(text) // 1024} KB:")
+        for label, scan in (("substring scans", substring_scan), ("scan_text", scan_text)):
+            seconds = min(timeit.repeat(lambda: scan(ecosystem, text), number=repeats, repeat=5))
+            found = sorted(tech.name for tech in scan(ecosystem, text))
+            print(f"  {label:16} {seconds / repeats * 1e3:6.2f} ms  {found}")
+
+
+if __name__ == "__main__":
+    main()
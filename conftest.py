@@ -0,0 +1 @@
+# Makes the `app` package importable from tests/ when running plain `pytest`
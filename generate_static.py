@@ -21,8 +21,10 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from app.github_client import GitHubClient
-from app.analyzers import ALL_ANALYZERS
-from app.analyzers.base import Technology
+from app.analyzers import run_analyzers
+from app.analyzers.profile import TechProfile
+from app.analyzers.registry import TechInfo
+from app.selection import ANALYZERS_BY_DEPTH, FULL, select_repos
 from app.svg.generator import SVGGenerator, CATEGORY_LABELS, CATEGORY_COLORS
 from app.svg.icons import fetch_icons
 from app.svg.themes import get_theme
@@ -36,30 +38,26 @@ SVGS_TO_GENERATE = [
 ]
 
 
-async def analyze_repo(owner: str, repo: str, github_client: GitHubClient) -> list[Technology]:
-    """Analyze a single repository with all analyzers."""
-    tasks = [analyzer.analyze(owner, repo, github_client) for analyzer in ALL_ANALYZERS]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+async def analyze_repo(
+    owner: str, repo: str, github_client: GitHubClient, depth: str = FULL
+) -> list[TechInfo]:
+    """Analyze a single repository with the analyzers for a depth."""
+    return await run_analyzers(owner, repo, github_client, ANALYZERS_BY_DEPTH[depth])
 
-    technologies = []
-    for result in results:
-        if isinstance(result, list):
-            technologies.extend(result)
-    return technologies
 
-
-async def analyze_user(username: str, github_client: GitHubClient, max_repos: int = 30) -> list[Technology]:
+async def analyze_user(username: str, github_client: GitHubClient, max_repos: int = 30) -> list[TechInfo]:
     """Analyze all repos for a user."""
     repos = await github_client.get_user_repos(username)
 
-    # Filter out forks and sort by stars
-    repos = [r for r in repos if not r.get("fork")]
-    repos.sort(key=lambda r: r.get("stargazers_count", 0), reverse=True)
-    repos = repos[:max_repos]
+    # Skip forks and empty repos, rank the rest and pick a depth for each
+    selected = select_repos(repos, max_repos)
 
-    print(f"Analyzing {len(repos)} repos for {username}...")
+    print(f"Analyzing {len(selected)} repos for {username}...")
 
-    tasks = [analyze_repo(username, repo["name"], github_client) for repo in repos]
+    tasks = [
+        analyze_repo(username, repo["name"], github_client, depth)
+        for repo, depth in selected
+    ]
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     all_technologies = []
@@ -85,26 +83,16 @@ CATEGORY_GROUPS = [
 ]
 
 
-def generate_stats_card(technologies: list[Technology], output_dir: Path, total_repos: int):
+def generate_stats_card(profile: TechProfile, output_dir: Path, total_repos: int):
     """Generate the Tech Stack Stats card."""
     theme = get_theme("light")
     templates_dir = Path(__file__).parent / "templates"
     env = Environment(loader=FileSystemLoader(str(templates_dir)), autoescape=False)
 
-    # Aggregate by name first, then count unique techs
-    tech_map: dict[str, Technology] = {}
-    for t in technologies:
-        if t.name in tech_map:
-            tech_map[t.name].count += t.count
-        else:
-            tech_map[t.name] = Technology(t.name, t.category, t.icon, t.color, t.count)
-
-    total_techs = len(tech_map)
+    total_techs = len(profile)
 
     # Count techs per raw category
-    cat_counts: dict[str, int] = {}
-    for t in tech_map.values():
-        cat_counts[t.category] = cat_counts.get(t.category, 0) + 1
+    cat_counts = {cat: len(indices) for cat, indices in profile.categories.items()}
 
     # Group into clean categories
     categories = []
@@ -171,19 +159,20 @@ async def main():
         repos = [r for r in repos if not r.get("fork")]
         technologies = await analyze_user(USERNAME, github)
         print(f"Detected {len(technologies)} technology entries")
+        profile = TechProfile.from_ids([[t.id for t in technologies]])
 
         # Fetch icons for all detected technologies
-        icon_names = list({t.icon for t in technologies})
+        icon_names = list({t.icon for t in profile.technologies})
         await fetch_icons(icon_names)
 
         # Generate stats card first to get its height
-        stats_height = generate_stats_card(technologies, output_dir, len(repos))
+        stats_height = generate_stats_card(profile, output_dir, len(repos))
 
         for svg_config in SVGS_TO_GENERATE:
-            techs = technologies
+            techs = profile
             # For pie chart: exclude languages, show only top 8
             if svg_config["style"] == "pie":
-                techs = [t for t in technologies if t.category != "language"]
+                techs = [t for t in profile.technologies if t.category != "language"]
 
             svg_content = svg_generator.generate(
                 technologies=techs,
@@ -0,0 +1,15 @@
+import pytest
+
+from app import breaker
+from app.cache import cache, manifest_cache, user_cache
+from app.metrics import metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    """Module-level caches, breakers and metrics start empty in every test."""
+    for c in (cache, manifest_cache, user_cache):
+        c.clear()
+    breaker._breakers.clear()
+    metrics.clear()
+    yield
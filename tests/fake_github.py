@@ -0,0 +1,64 @@
+import asyncio
+import base64
+import hashlib
+
+from app.github_client import GitHubClient
+
+
+class FakeGitHub:
+    """In-memory stand-in for GitHubClient's read methods.
+
+    Every call takes one event-loop round trip. `round_trips` counts how
+    many sequential waves of requests an analysis needed: calls started
+    before any call finished share a wave.
+    """
+
+    decode_content = staticmethod(GitHubClient.decode_content)
+
+    def __init__(self, files: dict[str, str], languages: dict[str, int] = None, dirs=None):
+        self.files = files
+        self.dirs = dirs or {}
+        self.languages = languages or {}
+        self.calls: list[str] = []
+        self._finished = 0
+        self._waves: set[int] = set()
+
+    @property
+    def round_trips(self) -> int:
+        return len(self._waves)
+
+    async def _call(self, name: str):
+        self.calls.append(name)
+        self._waves.add(self._finished)
+        await asyncio.sleep(0.001)
+        self._finished += 1
+
+    async def get_repo_contents(self, owner, repo, path=""):
+        await self._call(path)
+        if path in self.files:
+            text = self.files[path]
+            return {
+                "type": "file",
+                "sha": hashlib.sha1(text.encode()).hexdigest(),
+                "content": base64.b64encode(text.encode()).decode(),
+            }
+        if path in self.dirs:
+            return [{"name": name, "type": "file"} for name in self.dirs[path]]
+        return None
+
+    async def get_repo_languages(self, owner, repo):
+        await self._call("/languages")
+        return self.languages
+
+    async def get_repo_tree(self, owner, repo, names):
+        await self._call("/tree")
+        return [
+            {"path": path, "type": "blob", "sha": hashlib.sha1(text.encode()).hexdigest()}
+            for path, text in self.files.items()
+            if path.rsplit("/", 1)[-1] in names
+        ]
+
+    async def stream_file_lines(self, owner, repo, path):
+        await self._call(f"stream:{path}")
+        for line in self.files.get(path, "").splitlines():
+            yield line
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+from app import main
+from app.cache import TTLCache, cache, svg_cache
+
+
+def expire(c: TTLCache, key: str) -> None:
+    c._cache[key].expires_at = 0
+
+
+def test_expired_entries_are_misses_but_kept_for_stale_serving():
+    c = TTLCache(default_ttl=60)
+    c.set("k", "v")
+    assert 59 < c.expires_in("k") <= 60
+    expire(c, "k")
+
+    assert c.get("k") is None
+    assert c.get_stale("k") == "v"
+    assert c.expires_in("k") < 0
+    assert c.stats()["misses"] == 1 and c.stats()["hits"] == 0  # get_stale not counted
+
+    c.cleanup()
+    assert c.get_stale("k") is None and c.expires_in("k") is None
+
+
+def test_set_evicts_the_least_recently_used():
+    c = TTLCache(max_size=2)
+    c.set("a", 1)
+    c.set("b", 2)
+    c.get("a")
+    c.set("c", 3)
+    assert c.get_stale("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+
+
+def test_cache_stats_endpoint_reports_hits_misses_and_size():
+    svg_cache.clear()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.get("missing")
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/cache/stats")
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["api_cache"] == {
+        "hits": 1, "misses": 1, "hit_rate": "50.0%", "size": 2, "max_size": 1000,
+    }
+    for name in ("user_cache", "svg_cache", "manifest_cache"):
+        assert stats[name]["hits"] == stats[name]["misses"] == stats[name]["size"] == 0
@@ -0,0 +1,29 @@
+from app.analyzers.discovery import discover_manifests
+
+
+def blobs(*paths):
+    return [{"path": path, "type": "blob"} for path in paths]
+
+
+def test_low_value_and_vendored_directories_are_skipped():
+    tree = blobs(
+        "package.json",  # root: analyzed separately
+        "examples/react-app/package.json",
+        "docs/requirements.txt",
+        "tests/fixtures/app/package.json",
+        "node_modules/left-pad/package.json",
+        "web/package.json",
+    )
+    paths, found = discover_manifests(tree, {"package.json", "requirements.txt"}, budget=10)
+    assert paths == ["web/package.json"]
+    assert found == 1
+
+
+def test_significant_and_shallow_manifests_come_first():
+    tree = blobs(
+        "tools/scripts/deep/package.json",
+        "tools/package.json",
+        "packages/ui/package.json",
+    )
+    paths, _ = discover_manifests(tree, {"package.json"}, budget=2)
+    assert paths == ["packages/ui/package.json", "tools/package.json"]
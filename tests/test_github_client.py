@@ -0,0 +1,367 @@
+import asyncio
+import base64
+import json
+import time
+
+import httpx
+import pytest
+
+from app import github_client, main
+from app.analyzers.orchestrator import probe_alternatives
+from app.breaker import CLOSED, breaker_for
+from app.cache import cache
+from app.github_client import GitHubClient, GitHubUnavailable, _repo_from_graphql, use_deadline
+from app.metrics import metrics
+
+
+def make_client(handler) -> GitHubClient:
+    """A client whose requests are answered by handler(request)."""
+    client = GitHubClient(token="test-token")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_deadline_timeouts_do_not_count_against_github():
+    async def slow(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        client = make_client(slow)
+        limit = client._limiter.limit
+        for i in range(6):
+            with use_deadline(0.6), pytest.raises(GitHubUnavailable):
+                await client._request(f"/slow/{i}")
+        return client._limiter, limit
+
+    limiter, limit_before = asyncio.run(scenario())
+    breaker = breaker_for(GitHubClient.BASE_URL)
+    assert breaker.state == CLOSED and breaker._failures == 0
+    assert limiter.limit >= limit_before
+    assert limiter._samples == 0  # Cut-short attempts are not latency samples
+
+
+def test_stream_caches_missing_files_and_raises_on_errors():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        if request.url.path.endswith("yarn.lock"):
+            return httpx.Response(404)
+        return httpx.Response(502)
+
+    async def lines(client, path):
+        return [line async for line in client.stream_file_lines("o", "r", path)]
+
+    async def scenario():
+        client = make_client(handler)
+        assert await lines(client, "yarn.lock") == []
+        assert await lines(client, "yarn.lock") == []
+        with pytest.raises(GitHubUnavailable):
+            await lines(client, "go.sum")
+
+    asyncio.run(scenario())
+    assert requests == ["/repos/o/r/contents/yarn.lock", "/repos/o/r/contents/go.sum"]
+
+
+@pytest.mark.parametrize("headers, rate_limited", [
+    ({}, False),
+    ({"X-RateLimit-Remaining": "12"}, False),
+    ({"X-RateLimit-Remaining": "0"}, True),
+    ({"Retry-After": "30"}, True),
+])
+def test_only_rate_limit_403s_block_the_bucket(headers, rate_limited):
+    def forbidden(request):
+        return httpx.Response(403, headers=headers)
+
+    async def scenario():
+        client = make_client(forbidden)
+        if rate_limited:
+            with pytest.raises(GitHubUnavailable):
+                await client._request("/repos/o/blocked")
+        else:
+            assert await client._request("/repos/o/blocked") is None
+        return client._is_rate_limited("core")
+
+    assert asyncio.run(scenario()) is rate_limited
+
+
+def repo_node(i: int) -> dict:
+    return {
+        "name": f"r{i}",
+        "stargazerCount": 1000 - i,
+        "isFork": False,
+        "isArchived": False,
+        "isTemplate": False,
+        "pushedAt": "2026-09-01T00:00:00Z",
+        "diskUsage": 100,
+        "languages": {"edges": [
+            {"size": 5000, "node": {"name": "Rust"}},
+            {"size": 3000, "node": {"name": "Go"}},
+        ]},
+    }
+
+
+def graphql_listing(total: int, requests: list):
+    """Answer the repos query with `total` repos, paged by cursor."""
+    def handler(request):
+        requests.append(request)
+        if request.method != "POST":
+            return rest(request)
+        variables = json.loads(request.content)["variables"]
+        start = int(variables["after"] or 0)
+        end = min(start + variables["first"], total)
+        return httpx.Response(200, json={"data": {"repositoryOwner": {"repositories": {
+            "pageInfo": {"hasNextPage": end < total, "endCursor": str(end)},
+            "nodes": [repo_node(i) for i in range(start, end)],
+        }}}})
+    return handler
+
+
+def rest(request):
+    if request.url.path.endswith("/contents/Cargo.toml"):
+        content = base64.b64encode(b'[dependencies]\ntokio = "1"\n').decode()
+        return httpx.Response(200, json={"type": "file", "sha": "abc", "content": content})
+    if "/git/trees/" in request.url.path:
+        return httpx.Response(200, json={"tree": []})
+    return httpx.Response(404)
+
+
+def test_repo_from_graphql_matches_the_rest_shape():
+    assert _repo_from_graphql(repo_node(3)) == {
+        "name": "r3",
+        "stargazers_count": 997,
+        "fork": False,
+        "archived": False,
+        "is_template": False,
+        "pushed_at": "2026-09-01T00:00:00Z",
+        "size": 100,
+        "languages": {"Rust": 5000, "Go": 3000},
+    }
+    assert _repo_from_graphql({"name": "empty"})["languages"] == {}
+
+
+def test_graphql_listing_follows_pages_and_is_cached():
+    requests = []
+
+    async def scenario():
+        client = make_client(graphql_listing(250, requests))
+        first = await client.get_user_repos_graphql("u", limit=230)
+        second = await client.get_user_repos_graphql("u", limit=230)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert [repo["name"] for repo in first] == [f"r{i}" for i in range(230)]
+    assert second == first
+    pages = [json.loads(request.content)["variables"] for request in requests]
+    assert [(page["first"], page["after"]) for page in pages] == [
+        (100, None), (100, "100"), (30, "200")
+    ]
+
+
+def test_graphql_listing_stops_at_the_last_page():
+    requests = []
+    repos = asyncio.run(make_client(graphql_listing(3, requests)).get_user_repos_graphql("u", 30))
+    assert len(repos) == 3 and len(requests) == 1
+
+
+def test_analysis_uses_listed_languages_instead_of_requesting_them(monkeypatch):
+    requests = []
+    monkeypatch.setattr(main, "github", make_client(graphql_listing(4, requests)))
+    profile = asyncio.run(main.analyze_user("u", max_repos=4))
+
+    assert {t.name for t in profile.technologies} >= {"Rust", "Go", "Tokio"}
+    assert profile.completeness.succeeded == 4
+    paths = [request.url.path for request in requests]
+    assert not [path for path in paths if path.endswith("/languages")]
+
+
+def test_losing_probes_are_superseded_not_cancelled():
+    async def handler(request):
+        if request.url.path.endswith("/slow.txt"):
+            await asyncio.sleep(5)
+        return httpx.Response(200, json={"type": "file", "content": ""})
+
+    async def scenario():
+        client = make_client(handler)
+        entries = await probe_alternatives("o", "r", client, ("fast.txt", "slow.txt"))
+        await asyncio.sleep(0.01)  # Let the loser handle its cancellation
+        return entries
+
+    assert list(asyncio.run(scenario())) == ["fast.txt"]
+    assert metrics.get("github_requests_superseded") == 1
+    assert metrics.get("github_requests_cancelled") == 0
+
+
+def test_abandoned_requests_are_cancelled():
+    async def slow(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        client = make_client(slow)
+        probes = asyncio.ensure_future(probe_alternatives("o", "r", client, ("a", "b")))
+        await asyncio.sleep(0.05)
+        probes.cancel()  # The client went away
+        with pytest.raises(asyncio.CancelledError):
+            await probes
+
+    asyncio.run(scenario())
+    assert metrics.get("github_requests_cancelled") == 2
+    assert metrics.get("github_requests_superseded") == 0
+
+
+def test_tree_listing_keeps_and_caches_only_named_blobs():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"truncated": False, "tree": [
+            {"path": "web", "type": "tree", "sha": "1"},
+            {"path": "web/package.json", "type": "blob", "sha": "2", "size": 10},
+            {"path": "web/index.js", "type": "blob", "sha": "3", "size": 10},
+            {"path": "package-lock.json", "type": "blob", "sha": "4", "size": 10},
+        ]})
+
+    async def scenario():
+        client = make_client(handler)
+        names = frozenset({"package.json", "package-lock.json"})
+        return [await client.get_repo_tree("o", "r", names) for _ in range(2)]
+
+    first, second = asyncio.run(scenario())
+    assert first == second == [
+        {"path": "web/package.json", "type": "blob", "sha": "2"},
+        {"path": "package-lock.json", "type": "blob", "sha": "4"},
+    ]
+    assert len(requests) == 1
+    assert cache.get("github:/repos/o/r/git/trees/HEAD?recursive=1") is None
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(github_client, "RETRY_BASE_DELAY", 0.0)
+
+
+def flaky(failure, requests: list):
+    """Fail the first request with `failure`, then answer 200."""
+    def handler(request):
+        requests.append(request)
+        if len(requests) == 1:
+            if isinstance(failure, Exception):
+                raise failure
+            return httpx.Response(failure)
+        return httpx.Response(200, json={"ok": True})
+    return handler
+
+
+@pytest.mark.parametrize("failure", [502, httpx.ConnectError("connection refused")])
+def test_retries_5xx_and_network_errors(no_backoff, failure):
+    requests = []
+    data = asyncio.run(make_client(flaky(failure, requests))._request("/flaky"))
+    assert data == {"ok": True}
+    assert len(requests) == 2
+    assert metrics.get("github_retries") == 1
+    assert metrics.get("github_requests_failed") == 0
+
+
+def test_404_is_none_and_repeated_5xx_raise(no_backoff):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(404 if request.url.path == "/missing" else 503)
+
+    async def scenario():
+        client = make_client(handler)
+        assert await client._request("/missing") is None
+        with pytest.raises(GitHubUnavailable):
+            await client._request("/down")
+
+    asyncio.run(scenario())
+    assert requests == ["/missing"] + ["/down"] * github_client.MAX_ATTEMPTS
+    assert metrics.get("github_requests_failed") == 1
+    assert breaker_for(GitHubClient.BASE_URL)._failures == github_client.MAX_ATTEMPTS
+
+
+def test_gives_up_when_the_deadline_leaves_no_time_to_retry(monkeypatch):
+    monkeypatch.setattr(github_client, "RETRY_BASE_DELAY", 10.0)
+    monkeypatch.setattr(github_client, "RETRY_MAX_DELAY", 10.0)
+    monkeypatch.setattr(github_client.random, "uniform", lambda low, high: high)
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(502)
+
+    async def scenario():
+        with use_deadline(2.0), pytest.raises(GitHubUnavailable, match="deadline"):
+            await make_client(handler)._request("/down")
+
+    start = time.monotonic()
+    asyncio.run(scenario())
+    assert time.monotonic() - start < 1.0  # Not slept into the deadline
+    assert len(requests) == 1
+    assert metrics.get("github_retries") == 0
+
+
+def search_listing(search, requests: list):
+    """GraphQL refused; search answered by search(request); listing of 2 repos."""
+    def handler(request):
+        requests.append(request.url.path)
+        if request.method == "POST":
+            return httpx.Response(401)
+        if request.url.path == "/search/repositories":
+            return search(request)
+        if request.url.path == "/users/u/repos":
+            return httpx.Response(200, json=[{"name": "listed-1"}, {"name": "listed-2"}])
+        return httpx.Response(404)
+    return handler
+
+
+def test_top_repos_come_from_search_when_graphql_is_unavailable():
+    requests = []
+
+    def search(request):
+        assert request.url.params["q"] == "user:u fork:false"
+        assert request.url.params["sort"] == "stars"
+        return httpx.Response(200, json={"incomplete_results": False, "items": [{"name": "top"}]})
+
+    client = make_client(search_listing(search, requests))
+    repos = asyncio.run(client.get_top_user_repos("u", 10))
+    assert repos == [{"name": "top"}]
+    assert "/users/u/repos" not in requests
+    assert metrics.get("repo_listing_search") == 1
+
+
+@pytest.mark.parametrize("response", [
+    httpx.Response(200, json={"incomplete_results": True, "items": [{"name": "partial"}]}),
+    httpx.Response(422),
+    httpx.Response(503),
+])
+def test_incomplete_or_failed_search_falls_back_to_listing(no_backoff, response):
+    requests = []
+    client = make_client(search_listing(lambda request: response, requests))
+    repos = asyncio.run(client.get_top_user_repos("u", 10))
+    assert [repo["name"] for repo in repos] == ["listed-1", "listed-2"]
+    assert metrics.get("repo_listing_fallback") == 1
+
+
+def test_search_rate_limit_leaves_the_core_bucket_open():
+    requests = []
+
+    def search(request):
+        return httpx.Response(403, headers={"X-RateLimit-Remaining": "0", "Retry-After": "60"})
+
+    async def scenario():
+        client = make_client(search_listing(search, requests))
+        for _ in range(2):
+            repos = await client.get_top_user_repos("u", 10)
+            assert [repo["name"] for repo in repos] == ["listed-1", "listed-2"]
+            cache.clear()
+        return client
+
+    client = asyncio.run(scenario())
+    assert client._is_rate_limited("search") and not client._is_rate_limited("core")
+    # The blocked search bucket is not asked again; listing still is
+    assert requests.count("/search/repositories") == 1
+    assert requests.count("/users/u/repos") == 2
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app import hedging
+from app.hedging import MAX_CONCURRENT_HEDGES, Hedger
+from app.metrics import metrics
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(hedging, "HEDGING_ENABLED", True)
+
+
+def hedger(tokens: float = 5.0, delay: float = 0.01) -> Hedger:
+    """A Hedger past its warm-up that hedges after `delay` seconds."""
+    h = Hedger("test")
+    h._tokens = tokens
+    h._delay = delay
+    return h
+
+
+def copies(*outcomes):
+    """A fetch whose n-th call sleeps, then returns or raises outcomes[n]."""
+    calls = []
+
+    async def fetch():
+        delay, outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return fetch, calls
+
+
+def test_disabled_fetches_once():
+    fetch, calls = copies((0.05, "slow"), (0, "fast"))
+    assert asyncio.run(hedger().run(fetch)) == "slow"
+    assert calls == ["slow"]
+
+
+def test_first_success_wins_and_the_loser_is_measured(enabled):
+    async def scenario():
+        h = hedger()
+        fetch, calls = copies((0.2, "slow"), (0, "fast"))
+        result = await h.run(fetch)
+        await asyncio.sleep(0)  # Let the cancelled copy unwind
+        return result, calls, h._samples
+
+    result, calls, samples = asyncio.run(scenario())
+    assert result == "fast" and calls == ["slow", "fast"]
+    assert samples == 2
+    assert metrics.get("test_hedges") == 1 and metrics.get("test_hedge_wins") == 1
+
+
+def test_failed_copy_falls_back_to_the_other(enabled):
+    fetch, _ = copies((0.05, "slow"), (0, ValueError("boom")))
+    assert asyncio.run(hedger().run(fetch)) == "slow"
+
+
+def test_both_copies_failing_raises(enabled):
+    fetch, calls = copies((0.05, ValueError("first")), (0, ValueError("second")))
+    with pytest.raises(ValueError):
+        asyncio.run(hedger().run(fetch))
+    assert len(calls) == 2
+
+
+def test_hedges_are_limited_by_the_token_budget(enabled):
+    async def scenario():
+        h = hedger(tokens=0.0)
+        h.budget = 0.5
+        hedged = []
+        for _ in range(4):
+            fetch, calls = copies((0.05, "slow"), (0, "fast"))
+            await h.run(fetch)
+            hedged.append(len(calls) == 2)
+        return hedged
+
+    # Each request earns half a hedge
+    assert asyncio.run(scenario()) == [False, True, False, True]
+
+
+def test_concurrent_hedges_are_capped(enabled):
+    async def scenario():
+        h = hedger(tokens=100.0)
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return "slow"
+
+        await asyncio.gather(*(h.run(slow) for _ in range(MAX_CONCURRENT_HEDGES + 3)))
+        return h._outstanding
+
+    assert asyncio.run(scenario()) == 0
+    assert metrics.get("test_hedges") == MAX_CONCURRENT_HEDGES
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from app.limiter import BACKGROUND, AdaptiveLimiter, use_priority
+
+
+def test_cancelled_waiter_popped_by_release_raises_cancelled():
+    async def scenario():
+        limiter = AdaptiveLimiter(initial=2, min_limit=2, max_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)  # Let it queue
+
+        # Cancel, then free a slot before the waiter handles the cancellation
+        waiter.cancel()
+        limiter.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return limiter.in_flight
+
+    assert asyncio.run(scenario()) == 1
+
+
+def interactive_p99(batch: int) -> tuple[float, int]:
+    """Simulate interactive requests (3 upstream calls each) next to a
+    background batch on 10 slots; returns their p99 and the background
+    calls completed meanwhile."""
+    async def scenario():
+        limiter = AdaptiveLimiter(initial=10, min_limit=10, max_limit=10)
+        background_done = 0
+
+        async def upstream():
+            async with limiter.slot(measure=False):
+                await asyncio.sleep(0.01)
+
+        async def background_call():
+            nonlocal background_done
+            await upstream()
+            background_done += 1
+
+        with use_priority(BACKGROUND):
+            background = [asyncio.ensure_future(background_call()) for _ in range(batch)]
+        await asyncio.sleep(0)  # Let the batch take the slots and queue up
+        latencies = []
+        for _ in range(50):
+            start = time.perf_counter()
+            await asyncio.gather(*(upstream() for _ in range(3)))
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.005)
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+
+        latencies.sort()
+        return latencies[int(len(latencies) * 0.99)], background_done
+
+    return asyncio.run(scenario())
+
+
+def test_interactive_latency_stays_flat_during_background_batch():
+    idle_p99, _ = interactive_p99(0)
+    busy_p99, background_done = interactive_p99(5000)
+    # About one upstream round (10 ms) more, plus slack for a slow CI
+    # machine; FIFO would add 500 rounds (5 s)
+    assert busy_p99 < idle_p99 + 0.03
+    assert background_done > 0  # The batch still progresses
+
+
+def test_latency_jitter_does_not_lower_the_limit():
+    limiter = AdaptiveLimiter(initial=10, min_limit=1, max_limit=10)
+    for _ in range(50):
+        limiter.release(0.002)
+    for _ in range(20):
+        limiter.release(0.008)  # 4x, but only 6 ms slower
+    assert limiter.limit == 10
+
+
+def test_latency_inflation_lowers_the_limit():
+    limiter = AdaptiveLimiter(initial=10, min_limit=1, max_limit=10)
+    for _ in range(50):
+        limiter.release(0.05)
+    for _ in range(20):
+        limiter.release(0.5)
+    assert limiter.limit < 10
@@ -0,0 +1,103 @@
+import asyncio
+from array import array
+
+import httpx
+import pytest
+
+from app import main
+from app.analyzers.profile import Completeness, TechProfile
+from app.breaker import breaker_for
+from app.cache import user_cache
+from app.github_client import GitHubUnavailable
+from app.svg import icons
+
+CACHE_KEY = "user:u:2"
+REPOS = [{"name": "a", "size": 10}, {"name": "b", "size": 10}]
+
+
+class Listing:
+    def __init__(self, repos=REPOS):
+        self.repos = repos
+
+    async def get_top_user_repos(self, username, limit):
+        if self.repos is None:
+            raise GitHubUnavailable("rate limited (core)")
+        return self.repos
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """Repo "b" fails to analyze; the listing can be made to fail."""
+    listing = Listing()
+    monkeypatch.setattr(main, "github", listing)
+
+    async def analyze_repo(owner, repo, github_client, depth, languages):
+        if repo == "b":
+            raise GitHubUnavailable("rate limited (core)")
+        return array("H", [0])
+
+    monkeypatch.setattr(main, "analyze_repo", analyze_repo)
+    return listing
+
+
+def complete_profile() -> TechProfile:
+    return TechProfile.from_ids(
+        [[0], [1]], Completeness(attempted=2, succeeded=2)
+    )
+
+
+def expire(key: str) -> None:
+    user_cache._cache[key].expires_at = 0
+
+
+def test_incomplete_profile_is_cached_briefly(github):
+    profile = asyncio.run(main.analyze_user("u", max_repos=2))
+    assert profile.completeness.failed == 1
+    assert user_cache.get(CACHE_KEY) is profile
+    assert 0 < user_cache.expires_in(CACHE_KEY) <= main.INCOMPLETE_PROFILE_TTL
+
+
+def test_incomplete_result_does_not_replace_a_complete_profile(github):
+    complete = complete_profile()
+    user_cache.set(CACHE_KEY, complete)
+    expire(CACHE_KEY)
+
+    assert asyncio.run(main.analyze_user("u", max_repos=2)) is complete
+    # Cached again, briefly, so the next requests skip the failing fan-out
+    assert user_cache.get(CACHE_KEY) is complete
+    assert user_cache.expires_in(CACHE_KEY) <= main.INCOMPLETE_PROFILE_TTL
+
+
+def test_stale_profile_is_served_and_recached_when_listing_fails(github):
+    github.repos = None
+    with pytest.raises(GitHubUnavailable):
+        asyncio.run(main.analyze_user("u", max_repos=2))
+
+    complete = complete_profile()
+    user_cache.set(CACHE_KEY, complete)
+    expire(CACHE_KEY)
+    assert asyncio.run(main.analyze_user("u", max_repos=2)) is complete
+    assert user_cache.get(CACHE_KEY) is complete
+    assert user_cache.expires_in(CACHE_KEY) <= main.INCOMPLETE_PROFILE_TTL
+
+
+@pytest.mark.parametrize("icon_cached, max_age", [(True, 3600), (False, main.INCOMPLETE_PROFILE_TTL)])
+def test_cards_missing_icons_are_cached_briefly(monkeypatch, icon_cached, max_age):
+    async def analyze_repo(owner, repo, github_client):
+        return array("H", [0])  # React
+
+    monkeypatch.setattr(main, "analyze_repo", analyze_repo)
+    monkeypatch.setattr(icons, "_icon_cache", {"react": "data:,"} if icon_cached else {})
+    cdn = breaker_for(icons.DEVICON_CDN)
+    for _ in range(cdn.failure_threshold):
+        cdn.record_failure()  # Open: icons are skipped, not fetched
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/repo/o/r/tech.svg")
+
+    response = asyncio.run(scenario())
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == f"public, max-age={max_age}"
+    assert ("react" in icons._icon_cache) is icon_cached
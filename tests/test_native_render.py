@@ -0,0 +1,98 @@
+"""The native renderers must match the Jinja templates byte for byte,
+and both must match the golden files in tests/golden.
+
+After an intended rendering change, regenerate the golden files with
+UPDATE_GOLDEN=1 python -m pytest tests/test_native_render.py and review
+the diff.
+"""
+
+import dataclasses
+import itertools
+import os
+from pathlib import Path
+
+import pytest
+
+from app.analyzers.base import Technology
+from app.cache import svg_cache
+from app.svg import icons
+from app.svg.generator import SVGGenerator
+from app.svg.layout import get_layout
+from app.svg.styles import STYLES
+from app.svg.themes import THEMES
+
+CATEGORIES = ["language", "framework", "devops", "database", "ci", "weird-cat"]
+ICONS = ["react", "python", "docker", "no-such-icon"]
+ITEM_COUNTS = [0, 1, 2, 3, 5, 7, 10, 20]
+COLUMNS = [None, 1, 3]
+HIDE_BORDER = [False, True]
+MAX_ITEMS = [None, 4]
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+GOLDEN_THEMES = ["light", "dark", "dracula", "solarized-light"]
+
+native = SVGGenerator(renderer="native")
+jinja = SVGGenerator(renderer="jinja")
+
+
+def technologies(n: int) -> list[Technology]:
+    return [
+        Technology(
+            f"Tech <{i}> & co",
+            CATEGORIES[i % len(CATEGORIES)],
+            ICONS[i % len(ICONS)],
+            "#123456",
+            (n - i) // 2 + 1,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(autouse=True)
+def icon_cache(monkeypatch):
+    # Some icons embedded, some missing, like a real render
+    monkeypatch.setattr(icons, "_icon_cache", {"react": "data:image/svg+xml;base64,AAAA"})
+
+
+def render(generator: SVGGenerator, *args) -> str:
+    # Skeletons are cached without the renderer in the key
+    svg_cache.clear()
+    return generator.generate(*args)
+
+
+@pytest.mark.parametrize("style", sorted(STYLES))
+@pytest.mark.parametrize("theme", sorted(THEMES))
+def test_native_matches_jinja(style, theme):
+    for n, columns, hide_border, max_items in itertools.product(
+        ITEM_COUNTS, COLUMNS, HIDE_BORDER, MAX_ITEMS
+    ):
+        args = (technologies(n), "user<x>", theme, style, columns, hide_border, max_items)
+        assert render(native, *args) == render(jinja, *args), (n, columns, hide_border, max_items)
+
+
+@pytest.mark.parametrize("style", sorted(STYLES))
+def test_native_matches_jinja_forced_height(style):
+    for n in ITEM_COUNTS:
+        args = (technologies(n), "user", "light", style, None, False, None, 333)
+        assert render(native, *args) == render(jinja, *args), n
+
+
+@pytest.mark.parametrize("style", sorted(STYLES))
+@pytest.mark.parametrize("theme", GOLDEN_THEMES)
+def test_renders_match_golden_files(style, theme):
+    args = (technologies(7), "octocat", theme, style, None, False, None)
+    path = GOLDEN_DIR / f"{style}-{theme}.svg"
+    if os.getenv("UPDATE_GOLDEN"):
+        GOLDEN_DIR.mkdir(exist_ok=True)
+        path.write_text(render(native, *args))
+    golden = path.read_text()
+    assert render(native, *args) == golden
+    assert render(jinja, *args) == golden
+
+
+def test_cached_layouts_cannot_be_changed():
+    layout = get_layout("card", 5, 2)
+    assert layout.style.columns == 2 and STYLES["card"].columns == 3
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        layout.style.columns = 4
+    assert get_layout("card", 5, 2).style.columns == 2
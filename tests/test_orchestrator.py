@@ -0,0 +1,143 @@
+import asyncio
+import gc
+import json
+
+import pytest
+
+from app.analyzers import ALL_ANALYZERS, orchestrator, run_analyzers
+from app.github_client import GitHubUnavailable
+
+from .fake_github import FakeGitHub
+
+PACKAGE_JSON = json.dumps({"dependencies": {"react": "18"}})
+
+
+@pytest.fixture(autouse=True)
+def no_nested_manifests(monkeypatch):
+    monkeypatch.setattr(orchestrator, "MONOREPO_MANIFEST_BUDGET", 0)
+
+
+def analyze(github, languages=None):
+    techs = asyncio.run(run_analyzers("o", "r", github, ALL_ANALYZERS, languages))
+    return {tech.name for tech in techs}
+
+
+def test_known_languages_fetch_everything_in_one_round_trip():
+    github = FakeGitHub({"package.json": PACKAGE_JSON, "Dockerfile": "FROM node"})
+    names = analyze(github, languages={"JavaScript": 100})
+    assert {"React", "Docker"} <= names
+    assert github.round_trips == 1
+    assert "/languages" not in github.calls
+    assert "requirements.txt" not in github.calls  # Python analyzer pruned
+
+
+def test_unknown_languages_only_gate_language_specific_manifests():
+    github = FakeGitHub(
+        {"package.json": PACKAGE_JSON, "Dockerfile": "FROM node"},
+        languages={"JavaScript": 100},
+    )
+    names = analyze(github)
+    assert {"React", "Docker", "JavaScript"} <= names
+    assert github.round_trips == 2
+    # DevOps files go out with /languages, manifests after it
+    first_wave = github.calls[: github.calls.index("package.json")]
+    assert "/languages" in first_wave and "Dockerfile" in first_wave
+
+
+def test_nested_manifests_are_fetched_alongside_root_manifests(monkeypatch):
+    monkeypatch.setattr(orchestrator, "MONOREPO_MANIFEST_BUDGET", 8)
+    github = FakeGitHub(
+        {
+            "package.json": PACKAGE_JSON,
+            "services/api/requirements.txt": "fastapi\n",
+            "examples/demo/requirements.txt": "django\n",
+        },
+        languages={"JavaScript": 100, "Python": 50},
+    )
+    names = analyze(github)
+    assert {"React", "FastAPI"} <= names
+    assert "Django" not in names  # examples/ is skipped
+    # /languages and the tree, then root and nested manifests together
+    assert github.round_trips == 2
+
+
+def test_lockfiles_are_memoized_by_blob_sha(monkeypatch):
+    monkeypatch.setattr(orchestrator, "LOCKFILES_ENABLED", True)
+    monkeypatch.setattr(orchestrator, "MONOREPO_MANIFEST_BUDGET", 8)
+    lockfile = '{\n  "packages": {\n    "node_modules/next": {\n'
+    files = {"package.json": PACKAGE_JSON, "package-lock.json": lockfile}
+
+    first = FakeGitHub(files)
+    assert "Next.js" in analyze(first, languages={"JavaScript": 100})
+    assert "stream:package-lock.json" in first.calls
+
+    second = FakeGitHub(files)
+    assert "Next.js" in analyze(second, languages={"JavaScript": 100})
+    assert "stream:package-lock.json" not in second.calls
+
+
+class RateLimitedGitHub(FakeGitHub):
+    """Rate limited mid-analysis; the tree response beats its cancellation."""
+
+    async def get_repo_contents(self, owner, repo, path=""):
+        await self._call(path)
+        raise GitHubUnavailable("rate limited (core)")
+
+    async def get_repo_tree(self, owner, repo, names):
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            pass  # Like asyncio.wait_for when the response arrives as it is cancelled
+        raise GitHubUnavailable("rate limited (core)")
+
+
+def test_side_fetch_errors_after_cancellation_are_retrieved(monkeypatch):
+    monkeypatch.setattr(orchestrator, "MONOREPO_MANIFEST_BUDGET", 8)
+
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, context: errors.append(context))
+        github = RateLimitedGitHub({})
+        with pytest.raises(GitHubUnavailable):
+            await run_analyzers("o", "r", github, ALL_ANALYZERS, {"JavaScript": 100})
+        await asyncio.sleep(0.01)  # Let the side tasks finish
+        gc.collect()
+        return errors
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_cancelled_task_ending_with_an_error_is_retrieved():
+    async def swallows_cancellation():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            pass
+        raise GitHubUnavailable("rate limited (core)")
+
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(lambda _, context: errors.append(context))
+        task = asyncio.ensure_future(swallows_cancellation())
+        await asyncio.sleep(0)
+        with orchestrator._cancelling([task]):
+            pass
+        await asyncio.sleep(0.01)
+        del task
+        gc.collect()
+        return errors
+
+    assert asyncio.run(scenario()) == []
+
+
+class TreeUnavailableGitHub(FakeGitHub):
+    async def get_repo_tree(self, owner, repo, names):
+        await self._call("/tree")
+        raise GitHubUnavailable("rate limited (core)")
+
+
+def test_failed_tree_listing_skips_nested_manifests(monkeypatch):
+    monkeypatch.setattr(orchestrator, "MONOREPO_MANIFEST_BUDGET", 8)
+    github = TreeUnavailableGitHub({"package.json": PACKAGE_JSON, "web/package.json": PACKAGE_JSON})
+    assert "React" in analyze(github, languages={"JavaScript": 100})
+    assert "web/package.json" not in github.calls
@@ -0,0 +1,81 @@
+import asyncio
+
+from app import main
+from app.cache import TTLCache
+from app.limiter import BACKGROUND, INTERACTIVE, request_priority, use_priority
+from app.refresher import HOT_SCORE, Refresher
+
+
+def make_refresher(cache):
+    refreshed = []
+
+    def record(key):
+        async def refresh():
+            refreshed.append(key)
+        return refresh
+
+    refresher = Refresher(cache, lambda: None)
+    return refresher, refreshed, record
+
+
+def test_expiring_hot_keys_are_due():
+    cache = TTLCache(max_size=10)
+    refresher, _, record = make_refresher(cache)
+    cache.set("soon", 1, ttl=60)
+    cache.set("later", 1, ttl=3600)
+    for _ in range(int(HOT_SCORE) + 1):
+        refresher.record("soon", record("soon"))
+        refresher.record("later", record("later"))
+    refresher.record("cold", record("cold"))
+    assert refresher.due() == ["soon"]
+
+
+def test_evicted_keys_are_not_refreshed():
+    cache = TTLCache(max_size=2)
+    refresher, refreshed, record = make_refresher(cache)
+    for key in ("a", "b", "c"):
+        cache.set(key, 1, ttl=60)  # "a" is evicted by "c"
+        for _ in range(int(HOT_SCORE) + 1):
+            refresher.record(key, record(key))
+
+    asyncio.run(refresher.refresh_due())
+    assert sorted(refreshed) == ["b", "c"]
+
+
+def test_live_request_does_not_join_background_analysis():
+    priorities = []
+
+    async def analysis():
+        priorities.append(request_priority.get())
+        await asyncio.sleep(0.01)
+        return request_priority.get()
+
+    async def run():
+        with use_priority(BACKGROUND):
+            background = asyncio.ensure_future(main._join_analysis("k", analysis))
+        await asyncio.sleep(0)
+        live = main._join_analysis("k", analysis)
+        joined = main._join_analysis("k", analysis)
+        return await asyncio.gather(background, live, joined)
+
+    assert asyncio.run(run()) == [BACKGROUND, INTERACTIVE, INTERACTIVE]
+    assert priorities == [BACKGROUND, INTERACTIVE]
+    assert not main._analyses
+
+
+def test_background_caller_joins_live_analysis():
+    started = []
+
+    async def analysis():
+        started.append(request_priority.get())
+        await asyncio.sleep(0.01)
+
+    async def run():
+        live = asyncio.ensure_future(main._join_analysis("k", analysis))
+        await asyncio.sleep(0)
+        with use_priority(BACKGROUND):
+            await main._join_analysis("k", analysis)
+        await live
+
+    asyncio.run(run())
+    assert started == [INTERACTIVE]
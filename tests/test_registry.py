@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+from app.analyzers import ALL_ANALYZERS, REGISTRY, TechProfile, run_analyzers
+from app.analyzers.registry import TechRegistry
+
+from .fake_github import FakeGitHub
+
+
+def test_register_returns_the_same_entry():
+    registry = TechRegistry()
+    first = registry.register("Go", "language", "go", "#00ADD8")
+    assert registry.register("Go", "language", "go", "#00ADD8") is first
+    assert len(registry) == 1
+
+
+def test_conflicting_metadata_raises():
+    registry = TechRegistry()
+    registry.register("Go", "language", "go", "#00ADD8")
+    with pytest.raises(ValueError):
+        registry.register("Go", "language", "golang", "#00ADD8")
+
+
+def test_same_name_in_two_categories_is_two_entries():
+    language = REGISTRY.get("Svelte", "language")
+    framework = REGISTRY.get("Svelte", "framework")
+    assert language is not None and framework is not None
+    assert language.id != framework.id
+
+
+def test_svelte_dependency_is_a_framework():
+    package_json = json.dumps({"dependencies": {"svelte": "4"}})
+    github = FakeGitHub({"package.json": package_json})
+    techs = asyncio.run(run_analyzers(
+        "o", "r", github, ALL_ANALYZERS, {"Svelte": 100, "JavaScript": 10}
+    ))
+    profile = TechProfile.from_ids([[tech.id for tech in techs]])
+    assert "Svelte" in {t.name for t in profile.only("framework").technologies}
+    assert "Svelte" in {t.name for t in profile.only("language").technologies}
+    # Shown once on the full card
+    assert [t.name for t in profile.technologies].count("Svelte") == 1
+    assert profile.counts["Svelte"] == 2
+
+
+def test_profile_lists_a_name_once_under_each_category():
+    language = REGISTRY.get("Svelte", "language")
+    framework = REGISTRY.get("Svelte", "framework")
+    profile = TechProfile.from_ids([[language.id, framework.id], [language.id]])
+
+    assert [(t.name, t.category, t.count) for t in profile.technologies] == [
+        ("Svelte", "language", 3)
+    ]
+    frameworks = profile.only("framework").technologies
+    assert [(t.name, t.category) for t in frameworks] == [("Svelte", "framework")]
+    assert profile.technologies[0].category == "language"  # only() copies
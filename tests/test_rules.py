@@ -0,0 +1,15 @@
+from app.analyzers.rules import scan_text
+
+
+def names(ecosystem, text):
+    return {tech.name for tech in scan_text(ecosystem, text)}
+
+
+def test_names_match_as_whole_words():
+    setup_py = 'install_requires=["Django>=4", "fastapi", "torchvision"],  # promotor'
+    assert names("pypi", setup_py) == {"Django", "FastAPI"}
+
+
+def test_name_characters_on_either_side_prevent_a_match():
+    assert names("cargo", "warpgate = 1\nmy-tokio = 1\ntokio_util = 1") == set()
+    assert names("cargo", "warp = 1\n[dependencies.tokio]") == {"Warp", "Tokio"}
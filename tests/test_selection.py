@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from app.selection import FULL, LANGUAGES_ONLY, select_repos
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def repo(name, stars=0, pushed_at="2025-12-01T00:00:00Z", **extra):
+    return {"name": name, "stargazers_count": stars, "size": 100, "pushed_at": pushed_at, **extra}
+
+
+def test_every_selected_repo_is_analyzed_in_full_by_default():
+    repos = [repo(f"r{i}", stars=i) for i in range(30)]
+    selected = select_repos(repos, max_repos=20, now=NOW)
+    assert len(selected) == 20
+    assert {depth for _, depth in selected} == {FULL}
+
+
+def test_max_full_caps_full_analyses():
+    repos = [repo(f"r{i}", stars=i) for i in range(5)]
+    depths = [depth for _, depth in select_repos(repos, max_repos=5, max_full=2, now=NOW)]
+    assert depths == [FULL, FULL] + [LANGUAGES_ONLY] * 3
+
+
+def test_archived_forked_and_stale_repos():
+    repos = [
+        repo("fork", fork=True),
+        repo("archived", archived=True),
+        repo("stale", pushed_at="2020-01-01T00:00:00Z"),
+        repo("active"),
+    ]
+    selected = {r["name"]: depth for r, depth in select_repos(repos, max_repos=10, now=NOW)}
+    assert selected == {"archived": LANGUAGES_ONLY, "stale": LANGUAGES_ONLY, "active": FULL}
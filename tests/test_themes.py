@@ -0,0 +1,35 @@
+import pytest
+
+from app.analyzers.base import Technology
+from app.svg import generator, icons
+from app.svg.generator import SVGGenerator
+from app.svg.styles import STYLES
+from app.svg.themes import THEMES, apply_theme, make_skeleton
+
+TECHNOLOGIES = tuple(
+    Technology(name, category, icon, "#123456", count)
+    for name, category, icon, count in [
+        ("React", "framework", "react", 5),
+        ("Python", "language", "python", 3),
+        ("Docker", "devops", "docker", 2),
+        ("Weird & <odd>", "weird-cat", "no-such-icon", 1),
+    ]
+)
+
+
+@pytest.fixture(autouse=True)
+def icon_cache(monkeypatch):
+    monkeypatch.setattr(icons, "_icon_cache", {"react": "data:image/svg+xml;base64,AAAA"})
+
+
+@pytest.mark.parametrize("renderer", ["native", "jinja"])
+@pytest.mark.parametrize("style", sorted(STYLES))
+def test_skeleton_substitution_matches_direct_rendering(monkeypatch, renderer, style):
+    svg = SVGGenerator(renderer=renderer)
+    args = (TECHNOLOGIES, "octocat", STYLES[style], None, False, None)
+    skeleton = make_skeleton(svg._render(*args))
+    for name, theme in THEMES.items():
+        monkeypatch.setattr(generator, "PLACEHOLDER_THEME", theme)
+        themed = apply_theme(skeleton, theme)
+        assert themed == svg._render(*args), name
+        assert "\x00" not in themed, name